@@ -2,31 +2,110 @@
 Builds API endpoints for LibreLane flow management
 Handles build configuration, presets, and flow orchestration
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any
-
-from app.core.security import get_current_user
-from app.db.session import get_db
-from app.models.user import User
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+import hashlib
+import logging
+import orjson
+import uuid
+
+from app.core.cache import (
+    build_status_cache_key,
+    cache_delete,
+    cache_get,
+    cache_set,
+    project_access_cache_key
+)
+from app.core.config import settings
+from app.core.security import AuthenticatedUser, get_current_user
+from app.db.session import get_async_db
 from app.models.project import Project, ProjectVisibility
+from app.models.project_file import ProjectFile
 from app.models.job import Job, JobType, JobStatus
 from app.schemas.librelane import (
     LibreLaneFlowConfig,
     LibreLaneBuildRequest,
+    LibreLaneBatchBuildRequest,
     LibreLaneBuildStatus,
     LibreLaneFlowPreset,
-    LIBRELANE_PRESETS,
+    get_librelane_presets,
     PDKType
 )
 from app.schemas.job import JobCreate, JobResponse
+from app.workers.celery_app import celery_app
 from app.workers.tasks import run_build
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Static payloads are serialized once. Endpoints that return a Response
+# directly skip FastAPI's response_model validation; response_model is kept
+# on the decorators for the OpenAPI schema only.
+_PDKS_JSON = TypeAdapter(List[str]).dump_json([pdk.value for pdk in PDKType])
+_PDKS_ETAG = f'"{hashlib.md5(_PDKS_JSON).hexdigest()}"'
+_STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+
+@lru_cache(maxsize=1)
+def presets_payload() -> Tuple[bytes, str]:
+    """Serialized flow presets and their ETag, built on the first request"""
+    content = TypeAdapter(Dict[str, LibreLaneFlowPreset]).dump_json(get_librelane_presets())
+    return content, f'"{hashlib.md5(content).hexdigest()}"'
+
+
+def static_json_response(request: Request, content: bytes, etag: str) -> Response:
+    """
+    Build a cacheable response for a precomputed JSON payload
+
+    Returns 304 Not Modified when the client already holds the current ETag.
+    """
+    headers = {"ETag": etag, "Cache-Control": _STATIC_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+async def get_project_access(db: AsyncSession, project_id: int) -> Optional[Tuple[int, ProjectVisibility]]:
+    """
+    Get a project's owner and visibility, consulting the Redis cache first
+
+    Args:
+        db: Database session
+        project_id: Project ID
+
+    Returns:
+        Tuple of owner ID and visibility, or None if the project doesn't exist
+    """
+    cache_key = project_access_cache_key(project_id)
+
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        owner_id, visibility = orjson.loads(cached)
+        return owner_id, ProjectVisibility(visibility)
+
+    result = await db.execute(
+        select(Project.owner_id, Project.visibility).where(Project.id == project_id)
+    )
+    project = result.first()
+
+    if project is None:
+        return None
+
+    await cache_set(
+        cache_key,
+        orjson.dumps([project.owner_id, project.visibility.value]),
+        settings.PROJECT_ACCESS_CACHE_TTL_SECONDS
+    )
+    return project.owner_id, project.visibility
+
 
 @router.get("/presets", response_model=Dict[str, LibreLaneFlowPreset])
-async def get_build_presets():
+async def get_build_presets(request: Request):
     """
     Get available LibreLane flow presets
 
@@ -35,35 +114,41 @@ async def get_build_presets():
     - balanced: Balance between speed and quality
     - high_quality: Maximum quality for tape-out
     """
-    return LIBRELANE_PRESETS
+    return static_json_response(request, *presets_payload())
 
 
 @router.get("/pdks", response_model=List[str])
-async def get_available_pdks():
+async def get_available_pdks(request: Request):
     """
     Get list of available Process Design Kits (PDKs)
 
     Returns supported PDK options for ASIC builds
     """
-    return [pdk.value for pdk in PDKType]
+    return static_json_response(request, _PDKS_JSON, _PDKS_ETAG)
 
 
-@router.post("/{project_id}/build", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
-async def start_build(
-    project_id: int,
-    build_request: LibreLaneBuildRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+async def check_build_access(db: AsyncSession, project_id: int, user: AuthenticatedUser):
     """
-    Start a LibreLane ASIC build for a project
+    Check that a user can start builds for a project
 
-    - Creates a build job with the specified flow configuration
-    - Executes LibreLane in a Docker container
-    - Returns job information for status tracking
+    Args:
+        db: Database session
+        project_id: Project ID
+        user: Current user
+
+    Raises:
+        HTTPException: If project not found, user is not the owner, or the
+            project has no files
     """
-    # Get project
-    project = db.query(Project).filter(Project.id == project_id).first()
+    # Get project owner and whether it has any files in one query
+    result = await db.execute(
+        select(
+            Project.owner_id,
+            select(ProjectFile.id).where(ProjectFile.project_id == Project.id).exists().label("has_files")
+        )
+        .where(Project.id == project_id)
+    )
+    project = result.first()
 
     if not project:
         raise HTTPException(
@@ -72,51 +157,141 @@ async def start_build(
         )
 
     # Check if user is owner
-    if project.owner_id != current_user.id:
+    if project.owner_id != user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only project owner can start builds"
         )
 
     # Check if project has files
-    if not project.files:
+    if not project.has_files:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Project has no files. Upload Verilog files before building."
         )
 
+
+@router.post("/{project_id}/build", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
+async def start_build(
+    project_id: int,
+    build_request: LibreLaneBuildRequest,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Start a LibreLane ASIC build for a project
+
+    - Creates a build job with the specified flow configuration
+    - Executes LibreLane in a Docker container
+    - Returns job information for status tracking
+    """
+    await check_build_access(db, project_id, current_user)
+
     # Convert LibreLaneFlowConfig to dict for storage
     config_dict = build_request.config.model_dump()
 
-    # Create job
+    # Create job. The Celery task ID is generated up front so the job is
+    # stored with it in a single commit, before the worker can pick it up.
     job = Job(
         job_type=JobType.BUILD,
         status=JobStatus.PENDING,
         config=config_dict,
         project_id=project_id,
-        user_id=current_user.id
+        user_id=current_user.id,
+        celery_task_id=str(uuid.uuid4())
     )
 
     db.add(job)
-    db.commit()
-    db.refresh(job)
+    await db.commit()
+    await db.refresh(job)
+    await cache_delete(build_status_cache_key(project_id))
 
     # Queue Celery task
-    task = run_build.delay(job.id)
-
-    # Update job with celery task ID
-    job.celery_task_id = task.id
-    db.commit()
-    db.refresh(job)
+    try:
+        run_build.apply_async(args=[job.id], task_id=job.celery_task_id)
+    except Exception as e:
+        logger.error(f"Error queueing build job {job.id}: {e}")
+        job.status = JobStatus.FAILED
+        job.error_message = "Failed to queue build"
+        await db.commit()
+        # The status cached since the job was created still shows it pending
+        await cache_delete(build_status_cache_key(project_id))
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Failed to queue build"
+        )
 
     return job
 
 
+@router.post("/{project_id}/build/batch", response_model=List[JobResponse], status_code=status.HTTP_201_CREATED)
+async def start_builds(
+    project_id: int,
+    batch_request: LibreLaneBatchBuildRequest,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Start several LibreLane ASIC builds for a project
+
+    - Creates one build job per configuration in a single transaction
+    - Queues all jobs over a single broker connection
+    - Returns job information for status tracking
+    """
+    await check_build_access(db, project_id, current_user)
+
+    jobs = [
+        Job(
+            job_type=JobType.BUILD,
+            status=JobStatus.PENDING,
+            config=build_request.config.model_dump(),
+            project_id=project_id,
+            user_id=current_user.id,
+            celery_task_id=str(uuid.uuid4())
+        )
+        for build_request in batch_request.builds
+    ]
+
+    db.add_all(jobs)
+    await db.commit()
+    await cache_delete(build_status_cache_key(project_id))
+
+    # Reload all jobs (server-side defaults) in one query
+    result = await db.execute(
+        select(Job)
+        .where(Job.id.in_([job.id for job in jobs]))
+        .order_by(Job.id)
+        .execution_options(populate_existing=True)
+    )
+    jobs = list(result.scalars())
+
+    # Queue Celery tasks, reusing one producer for the whole batch
+    queued = 0
+    try:
+        with celery_app.producer_or_acquire() as producer:
+            for job in jobs:
+                run_build.apply_async(args=[job.id], task_id=job.celery_task_id, producer=producer)
+                queued += 1
+    except Exception as e:
+        logger.error(f"Error queueing build jobs for project {project_id}: {e}")
+        for job in jobs[queued:]:
+            job.status = JobStatus.FAILED
+            job.error_message = "Failed to queue build"
+        await db.commit()
+        await cache_delete(build_status_cache_key(project_id))
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to queue builds ({queued} of {len(jobs)} queued)"
+        )
+
+    return jobs
+
+
 @router.get("/{project_id}/build/config", response_model=LibreLaneFlowConfig)
 async def get_build_config(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get the last used build configuration for a project
@@ -125,7 +300,10 @@ async def get_build_config(
     - Falls back to default configuration if no previous builds
     """
     # Get project
-    project = db.query(Project).filter(Project.id == project_id).first()
+    result = await db.execute(
+        select(Project.owner_id, Project.visibility, Project.name).where(Project.id == project_id)
+    )
+    project = result.first()
 
     if not project:
         raise HTTPException(
@@ -142,36 +320,45 @@ async def get_build_config(
 
     # Auto-detect all Verilog/SystemVerilog files from current project
     verilog_extensions = ('.v', '.sv', '.vh')
-    verilog_files = [f.filepath for f in project.files if f.filepath.endswith(verilog_extensions)]
+    result = await db.execute(
+        select(ProjectFile.filepath).where(
+            ProjectFile.project_id == project_id,
+            or_(*(ProjectFile.filepath.like(f"%{ext}") for ext in verilog_extensions))
+        )
+    )
+    verilog_files = list(result.scalars())
 
-    # Get most recent build job
-    last_build = (
-        db.query(Job)
-        .filter(Job.project_id == project_id, Job.job_type == JobType.BUILD)
+    # Get config of most recent build job
+    result = await db.execute(
+        select(Job.config)
+        .where(Job.project_id == project_id, Job.job_type == JobType.BUILD)
         .order_by(Job.created_at.desc())
-        .first()
+        .limit(1)
     )
+    last_config = result.scalar_one_or_none()
 
-    if last_build and last_build.config:
-        # Return last used configuration, but update verilog_files with current project files
-        config = LibreLaneFlowConfig(**last_build.config)
+    if last_config:
+        # Return last used configuration, but update verilog_files with current project files.
+        # Stored configs were validated when the build was started, so skip re-validation.
+        config = LibreLaneFlowConfig.model_construct(**last_config)
         config.verilog_files = verilog_files  # Always use current project files
         config.design_name = project.name  # Also update design name to match project
-        return config
     else:
         # Return default configuration with project-specific values
-        return LibreLaneFlowConfig(
+        config = LibreLaneFlowConfig(
             design_name=project.name,
             verilog_files=verilog_files,
         )
 
+    return Response(content=config.model_dump_json(), media_type="application/json")
+
 
 @router.put("/{project_id}/build/config", response_model=Dict[str, str])
 async def save_build_config(
     project_id: int,
     config: LibreLaneFlowConfig,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Save build configuration for a project (for future reference)
@@ -180,7 +367,8 @@ async def save_build_config(
     Use POST /{project_id}/build to actually start a build.
     """
     # Get project
-    project = db.query(Project).filter(Project.id == project_id).first()
+    result = await db.execute(select(Project.owner_id).where(Project.id == project_id))
+    project = result.first()
 
     if not project:
         raise HTTPException(
@@ -209,8 +397,8 @@ async def save_build_config(
 @router.get("/{project_id}/build/status", response_model=LibreLaneBuildStatus)
 async def get_build_status(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get the status of the latest build for a project
@@ -218,8 +406,8 @@ async def get_build_status(
     - Returns status of most recent build job
     - Includes progress information if available
     """
-    # Get project
-    project = db.query(Project).filter(Project.id == project_id).first()
+    # Get project (cached, as clients poll this endpoint)
+    project = await get_project_access(db, project_id)
 
     if not project:
         raise HTTPException(
@@ -228,19 +416,27 @@ async def get_build_status(
         )
 
     # Check access
-    if project.owner_id != current_user.id and project.visibility != ProjectVisibility.PUBLIC:
+    owner_id, visibility = project
+    if owner_id != current_user.id and visibility != ProjectVisibility.PUBLIC:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
         )
 
+    # Serve from cache while clients poll; workers drop the key on every update
+    cache_key = build_status_cache_key(project_id)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     # Get most recent build job
-    latest_build = (
-        db.query(Job)
-        .filter(Job.project_id == project_id, Job.job_type == JobType.BUILD)
+    result = await db.execute(
+        select(Job.id, Job.status, Job.current_step, Job.progress_data, Job.logs)
+        .where(Job.project_id == project_id, Job.job_type == JobType.BUILD)
         .order_by(Job.created_at.desc())
-        .first()
+        .limit(1)
     )
+    latest_build = result.first()
 
     if not latest_build:
         raise HTTPException(
@@ -248,10 +444,17 @@ async def get_build_status(
             detail="No build jobs found for this project"
         )
 
-    return LibreLaneBuildStatus(
-        job_id=latest_build.id,
-        status=latest_build.status.value,
-        current_step=latest_build.current_step,
-        progress_data=latest_build.progress_data,
-        logs=latest_build.logs
-    )
+    # Polled frequently while a build runs; the row maps 1:1 onto
+    # LibreLaneBuildStatus, so serialize it directly instead of
+    # validating it into the model first
+    content = orjson.dumps({
+        "job_id": latest_build.id,
+        "status": latest_build.status.value,
+        "progress": None,
+        "current_step": latest_build.current_step,
+        "progress_data": latest_build.progress_data,
+        "logs": latest_build.logs,
+    })
+    await cache_set(cache_key, content, settings.BUILD_STATUS_CACHE_TTL_SECONDS)
+
+    return Response(content=content, media_type="application/json")
@@ -2,43 +2,100 @@
 Project Files API endpoints
 Handles file uploads, downloads, and management within projects
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, RedirectResponse, StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from starlette.background import BackgroundTask
+from sqlalchemy import select, update, delete, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, load_only, undefer
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from urllib.parse import quote
 import logging
+import re
 
-from app.core.security import get_current_user
+from app.core.security import AuthenticatedUser, get_current_user
 from app.core.config import settings
-from app.db.session import get_db
-from app.models.user import User
+from app.db.session import get_async_db
 from app.models.project import Project, ProjectVisibility
 from app.models.project_file import ProjectFile
 from app.schemas.project import (
     ProjectFileCreate,
     ProjectFileUpdate,
     ProjectFileResponse,
-    ProjectFileWithContent
+    ProjectFileWithContent,
+    validate_file_path
 )
-from app.services.module_extractor import module_extractor
+from app.workers.tasks import extract_file_modules
 from app.services.storage import storage_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Read endpoints validate ORM rows once and return the serialized bytes
+# directly, skipping FastAPI's second response_model validation pass
+_file_list_adapter = TypeAdapter(List[ProjectFileResponse])
 
-def check_project_access(project: Project, user: User, write_access: bool = False):
+# Raw downloads may be cached by the browser but must be revalidated
+_FILE_CACHE_CONTROL = "private, no-cache"
+
+# Characters replaced in the plain Content-Disposition filename parameter
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\x20-\x7e]|["\\]')
+
+# Project columns needed by check_project_access; the rest of the row
+# (description etc.) is never loaded by these endpoints
+_PROJECT_ACCESS_COLUMNS = (Project.id, Project.owner_id, Project.visibility)
+
+
+def json_body(model: Type[BaseModel]) -> Callable:
+    """
+    Dependency that parses and validates a JSON body in a single pass
+
+    File bodies carry full source content; model_validate_json parses the
+    raw bytes directly instead of building an intermediate dict first.
+    """
+    async def parse(request: Request) -> BaseModel:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+            )
+    return parse
+
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """OpenAPI request body for endpoints that use json_body()"""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
+
+def check_project_access(project: Optional[Project], user: AuthenticatedUser, write_access: bool = False):
     """
     Check if user has access to project
     
     Args:
-        project: Project to check
+        project: Project to check, or None if the lookup found nothing
         user: Current user
         write_access: If True, requires ownership
     
     Raises:
-        HTTPException: If access denied
+        HTTPException: If project not found or access denied
     """
+    if project is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
     if write_access:
         if project.owner_id != user.id:
             raise HTTPException(
@@ -53,11 +110,154 @@ def check_project_access(project: Project, user: User, write_access: bool = Fals
             )
 
 
+async def get_project_file_or_404(
+    db: AsyncSession,
+    project_id: int,
+    file_id: int,
+    user: AuthenticatedUser,
+    write_access: bool = False,
+    with_content: bool = False
+) -> ProjectFile:
+    """
+    Fetch a project file together with its project and check access
+
+    Args:
+        db: Database session
+        project_id: Project ID
+        file_id: File ID
+        user: Current user
+        write_access: If True, requires ownership
+        with_content: If True, also loads the deferred legacy content column
+
+    Returns:
+        The project file
+
+    Raises:
+        HTTPException: If file not found or access denied
+    """
+    query = (
+        select(ProjectFile)
+        .join(ProjectFile.project)
+        .options(contains_eager(ProjectFile.project).load_only(*_PROJECT_ACCESS_COLUMNS))
+        .where(ProjectFile.id == file_id, ProjectFile.project_id == project_id)
+    )
+    if with_content:
+        query = query.options(undefer(ProjectFile.content))
+
+    file = (await db.execute(query)).scalar_one_or_none()
+
+    if not file:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+
+    check_project_access(file.project, user, write_access=write_access)
+
+    return file
+
+
+def content_disposition(filename: str) -> str:
+    """
+    Build an inline Content-Disposition header value for a stored file
+
+    Filenames are user-controlled, so they are never interpolated raw: the
+    plain filename parameter gets a printable-ASCII fallback and the exact
+    name goes percent-encoded in the RFC 5987 filename* parameter.
+    """
+    fallback = _UNSAFE_FILENAME_CHARS_RE.sub("_", filename)
+    return f"inline; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range Range header against a file size
+
+    Headers this endpoint doesn't serve partially (other units, multiple
+    ranges, malformed specs) are ignored so the full file is returned.
+
+    Args:
+        range_header: Value of the Range request header
+        size: Total file size in bytes
+
+    Returns:
+        Inclusive (start, end) byte offsets, or None to ignore the header
+
+    Raises:
+        HTTPException: If the range lies entirely outside the file
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_spec, separator, end_spec = spec.strip().partition("-")
+    if not separator or not (start_spec or end_spec) or "-" in end_spec:
+        return None
+
+    try:
+        if start_spec:
+            start = int(start_spec)
+            if end_spec:
+                end = int(end_spec)
+                if end < start:
+                    return None
+            else:
+                end = size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(end_spec), 0)
+            end = size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+
+    return start, min(end, size - 1)
+
+
+def encode_file_content(content: str) -> bytes:
+    """
+    Encode file content to UTF-8, enforcing the file size limit
+
+    Args:
+        content: File content as text
+
+    Returns:
+        UTF-8 encoded content
+
+    Raises:
+        HTTPException: If content exceeds the maximum file size
+    """
+    max_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+
+    # A UTF-8 string is at least one byte per character, so oversized
+    # content can be rejected before paying for the encode
+    if len(content) > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File size exceeds maximum allowed ({settings.MAX_FILE_SIZE_MB}MB)"
+        )
+
+    file_bytes = content.encode('utf-8')
+    if len(file_bytes) > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File size exceeds maximum allowed ({settings.MAX_FILE_SIZE_MB}MB)"
+        )
+
+    return file_bytes
+
+
 @router.get("/{project_id}/files", response_model=List[ProjectFileResponse])
 async def list_project_files(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List all files in a project
@@ -65,27 +265,28 @@ async def list_project_files(
     - Returns list of files with metadata
     - User must have read access to project
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-    
-    check_project_access(project, current_user)
-    
-    files = db.query(ProjectFile).filter(ProjectFile.project_id == project_id).all()
-    
-    return files
+    result = await db.execute(
+        select(Project).options(load_only(*_PROJECT_ACCESS_COLUMNS)).where(Project.id == project_id)
+    )
+    check_project_access(result.scalar_one_or_none(), current_user)
+
+    result = await db.execute(select(ProjectFile).where(ProjectFile.project_id == project_id))
+    files = _file_list_adapter.validate_python(result.scalars().all(), from_attributes=True)
+
+    return Response(content=_file_list_adapter.dump_json(files), media_type="application/json")
 
 
-@router.post("/{project_id}/files", response_model=ProjectFileResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{project_id}/files",
+    response_model=ProjectFileResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=json_body_openapi(ProjectFileCreate)
+)
 async def create_project_file(
     project_id: int,
-    file_data: ProjectFileCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    file_data: ProjectFileCreate = Depends(json_body(ProjectFileCreate)),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new file in project
@@ -93,37 +294,30 @@ async def create_project_file(
     - Adds new file with content
     - Only project owner can create files
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
+    # Fetch project and any file already at this path in one round trip
+    result = await db.execute(
+        select(Project, ProjectFile.id)
+        .options(load_only(*_PROJECT_ACCESS_COLUMNS))
+        .outerjoin(
+            ProjectFile,
+            and_(ProjectFile.project_id == Project.id, ProjectFile.filepath == file_data.filepath)
         )
-    
+        .where(Project.id == project_id)
+    )
+    project, existing_file_id = result.first() or (None, None)
+
     check_project_access(project, current_user, write_access=True)
-    
+
     # Check if file already exists
-    existing_file = db.query(ProjectFile).filter(
-        ProjectFile.project_id == project_id,
-        ProjectFile.filepath == file_data.filepath
-    ).first()
-    
-    if existing_file:
+    if existing_file_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File already exists at this path"
         )
     
-    # Calculate file size
-    size_bytes = len(file_data.content.encode('utf-8')) if file_data.content else 0
-
-    # Check file size limit
-    if size_bytes > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File size exceeds maximum allowed ({settings.MAX_FILE_SIZE_MB}MB)"
-        )
+    # Encode once; the bytes are reused for the size and the upload
+    file_bytes = encode_file_content(file_data.content) if file_data.content else b""
+    size_bytes = len(file_bytes)
 
     # Create new file record (without content first, to get the ID)
     new_file = ProjectFile(
@@ -136,14 +330,14 @@ async def create_project_file(
     )
 
     db.add(new_file)
-    db.commit()
-    db.refresh(new_file)
+    await db.commit()
+    await db.refresh(new_file)
 
     # Upload content to MinIO if provided
     if file_data.content:
         try:
-            file_bytes = file_data.content.encode('utf-8')
-            bucket, key, content_hash = storage_service.upload_file(
+            bucket, key, content_hash = await run_in_threadpool(
+                storage_service.upload_file,
                 file_bytes,
                 project_id,
                 new_file.id,
@@ -155,33 +349,27 @@ async def create_project_file(
             new_file.minio_bucket = bucket
             new_file.minio_key = key
             new_file.content_hash = content_hash
-            db.commit()
-            db.refresh(new_file)
+            await db.commit()
+            await db.refresh(new_file)
 
             logger.info(f"Uploaded file {file_data.filename} to MinIO: {key}")
         except Exception as e:
             logger.error(f"Error uploading file to MinIO: {e}")
             # Rollback the file creation if upload fails
-            db.delete(new_file)
-            db.commit()
+            await db.delete(new_file)
+            await db.commit()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to upload file to storage"
             )
 
-    # Extract modules from file content
+    # Extract modules from file content in the background. Publishing to the
+    # broker is blocking I/O, so it runs in the threadpool like MinIO calls
     if file_data.content:
         try:
-            result = module_extractor.extract_modules_from_file(
-                file_data.content,
-                new_file.id,
-                project_id,
-                file_data.filename,
-                db
-            )
-            logger.info(f"Extracted {result.modules_found} modules from {file_data.filename}")
+            await run_in_threadpool(extract_file_modules.delay, new_file.id)
         except Exception as e:
-            logger.error(f"Error extracting modules from {file_data.filename}: {e}")
+            logger.error(f"Error queueing module extraction for {file_data.filename}: {e}")
             # Don't fail the file creation if module extraction fails
 
     return new_file
@@ -191,8 +379,8 @@ async def create_project_file(
 async def get_project_file(
     project_id: int,
     file_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get file content
@@ -200,51 +388,149 @@ async def get_project_file(
     - Returns file with full content
     - User must have read access to project
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
+    file = await get_project_file_or_404(db, project_id, file_id, current_user, with_content=True)
 
-    check_project_access(project, current_user)
+    # If file uses MinIO, download content from there
+    # if file.use_minio and file.minio_bucket and file.minio_key:
+    content = file.content
+    if file.minio_bucket and file.minio_key:
+        try:
+            file_bytes = await run_in_threadpool(storage_service.download_file, file.minio_bucket, file.minio_key)
+            content = file_bytes.decode('utf-8')
+            logger.debug(f"Downloaded file {file.filename} from MinIO")
+        except Exception as e:
+            logger.error(f"Error downloading file from MinIO: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to retrieve file content from storage"
+            )
 
-    file = db.query(ProjectFile).filter(
-        ProjectFile.id == file_id,
-        ProjectFile.project_id == project_id
-    ).first()
+    # Content can be several MB; serialize it straight through orjson
+    # rather than validating it into a ProjectFileWithContent first
+    return ORJSONResponse({
+        "id": file.id,
+        "filename": file.filename,
+        "filepath": file.filepath,
+        "size_bytes": file.size_bytes,
+        "mime_type": file.mime_type,
+        "created_at": file.created_at,
+        "updated_at": file.updated_at,
+        "content": content,
+    })
+
+
+@router.get("/{project_id}/files/{file_id}/raw")
+async def download_project_file(
+    project_id: int,
+    file_id: int,
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Download raw file content
 
-    if not file:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="File not found"
+    - Streams the file from MinIO without buffering it in memory, or redirects
+      to a presigned MinIO URL when FILE_DOWNLOAD_REDIRECT is enabled
+    - Serves single byte ranges (206 Partial Content) for partial and resumed downloads
+    - Returns 304 Not Modified if the client's copy is current (ETag is the content hash)
+    - User must have read access to project
+    """
+    file = await get_project_file_or_404(db, project_id, file_id, current_user, with_content=True)
+
+    media_type = file.mime_type or "text/plain"
+    headers = {"Content-Disposition": content_disposition(file.filename)}
+
+    if file.content_hash:
+        # Files are private and mutable: allow caching but always revalidate
+        etag = f'"{file.content_hash}"'
+        headers["ETag"] = etag
+        headers["Cache-Control"] = _FILE_CACHE_CONTROL
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if file.minio_bucket and file.minio_key and settings.FILE_DOWNLOAD_REDIRECT:
+        # Let the client fetch the bytes (and any ranges) from MinIO itself
+        try:
+            url = await run_in_threadpool(
+                storage_service.presigned_download_url,
+                file.minio_bucket,
+                file.minio_key,
+                timedelta(seconds=settings.FILE_DOWNLOAD_URL_EXPIRE_SECONDS),
+                content_disposition=headers["Content-Disposition"],
+                content_type=media_type
+            )
+        except Exception as e:
+            logger.error(f"Error presigning MinIO download: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to retrieve file content from storage"
+            )
+        return RedirectResponse(
+            url,
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+            headers={"Cache-Control": "no-store"}
         )
 
-    # If file uses MinIO, download content from there
-    # if file.use_minio and file.minio_bucket and file.minio_key:
     if file.minio_bucket and file.minio_key:
+        headers["Accept-Ranges"] = "bytes"
+
+        # Honor Range unless If-Range names a different version of the file
+        byte_range = None
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if range_header and (if_range is None or if_range == headers.get("ETag")):
+            byte_range = parse_byte_range(range_header, file.size_bytes or 0)
+
+        offset, length = 0, 0
+        status_code = status.HTTP_200_OK
+        if byte_range is not None:
+            start, end = byte_range
+            offset, length = start, end - start + 1
+            status_code = status.HTTP_206_PARTIAL_CONTENT
+            headers["Content-Range"] = f"bytes {start}-{end}/{file.size_bytes}"
+
         try:
-            file_bytes = storage_service.download_file(file.minio_bucket, file.minio_key)
-            file.content = file_bytes.decode('utf-8')
-            logger.debug(f"Downloaded file {file.filename} from MinIO")
+            chunks = await run_in_threadpool(
+                storage_service.stream_file,
+                file.minio_bucket,
+                file.minio_key,
+                offset=offset,
+                length=length
+            )
         except Exception as e:
             logger.error(f"Error downloading file from MinIO: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to retrieve file content from storage"
             )
-    print("File = ",file.content)
-    return file
+        if chunks.content_length is not None:
+            headers["Content-Length"] = str(chunks.content_length)
+        # Runs after the response completes or the client disconnects
+        return StreamingResponse(
+            chunks,
+            status_code=status_code,
+            media_type=media_type,
+            headers=headers,
+            background=BackgroundTask(chunks.close)
+        )
+
+    # Fall back to legacy content field
+    return Response(content=(file.content or "").encode('utf-8'), media_type=media_type, headers=headers)
 
 
-@router.put("/{project_id}/files/{file_id}", response_model=ProjectFileResponse)
+@router.put(
+    "/{project_id}/files/{file_id}",
+    response_model=ProjectFileResponse,
+    openapi_extra=json_body_openapi(ProjectFileUpdate)
+)
 async def update_project_file(
     project_id: int,
     file_id: int,
-    file_data: ProjectFileUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    file_data: ProjectFileUpdate = Depends(json_body(ProjectFileUpdate)),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update file content
@@ -252,59 +538,26 @@ async def update_project_file(
     - Updates file content and/or filename
     - Only project owner can update files
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-    
-    check_project_access(project, current_user, write_access=True)
-    
-    file = db.query(ProjectFile).filter(
-        ProjectFile.id == file_id,
-        ProjectFile.project_id == project_id
-    ).first()
-    
-    if not file:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="File not found"
-        )
-    
+    values = {}
+
     # Update content if provided
     content_updated = False
     if file_data.content is not None:
-        file_bytes = file_data.content.encode('utf-8')
-        file.size_bytes = len(file_bytes)
-        content_updated = True
+        file_bytes = encode_file_content(file_data.content)
 
-        # Check file size limit
-        if file.size_bytes > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File size exceeds maximum allowed ({settings.MAX_FILE_SIZE_MB}MB)"
-            )
+        # The storage key and content type come from the stored row
+        file = await get_project_file_or_404(db, project_id, file_id, current_user, write_access=True)
 
         # Upload to MinIO
         try:
-            bucket, key, content_hash = storage_service.upload_file(
+            bucket, key, content_hash = await run_in_threadpool(
+                storage_service.upload_file,
                 file_bytes,
                 project_id,
                 file.id,
                 file.filename,
                 file.mime_type or "text/plain"
             )
-
-            # Update file record with MinIO information
-            file.minio_bucket = bucket
-            file.minio_key = key
-            file.content_hash = content_hash
-            file.use_minio = True
-            # Clear legacy content field to save DB space
-            file.content = None
-
             logger.info(f"Updated file {file.filename} in MinIO: {key}")
         except Exception as e:
             logger.error(f"Error uploading updated file to MinIO: {e}")
@@ -313,26 +566,55 @@ async def update_project_file(
                 detail="Failed to save file to storage"
             )
 
+        # Update file record with MinIO information and clear the legacy
+        # content field to save DB space
+        values.update(
+            size_bytes=len(file_bytes),
+            minio_bucket=bucket,
+            minio_key=key,
+            content_hash=content_hash,
+            use_minio=True,
+            content=None
+        )
+        content_updated = True
+
     # Update filename if provided
     if file_data.filename is not None:
-        file.filename = file_data.filename
+        values["filename"] = file_data.filename
+
+    if not values:
+        return await get_project_file_or_404(db, project_id, file_id, current_user, write_access=True)
+
+    # Ownership is part of the WHERE clause, so the update and the access
+    # check happen in a single statement
+    result = await db.execute(
+        update(ProjectFile)
+        .where(
+            ProjectFile.id == file_id,
+            ProjectFile.project_id == project_id,
+            ProjectFile.project.has(Project.owner_id == current_user.id)
+        )
+        .values(**values)
+        .returning(ProjectFile)
+    )
+    file = result.scalar_one_or_none()
 
-    db.commit()
-    db.refresh(file)
+    if file is None:
+        # Nothing matched; report whether the file is missing or not ours
+        await get_project_file_or_404(db, project_id, file_id, current_user, write_access=True)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
 
-    # Re-extract modules if content was updated
+    await db.commit()
+
+    # Re-extract modules in the background if content was updated
     if content_updated and file_data.content:
         try:
-            result = module_extractor.extract_modules_from_file(
-                file_data.content,
-                file.id,
-                project_id,
-                file.filename,
-                db
-            )
-            logger.info(f"Re-extracted {result.modules_found} modules from {file.filename}")
+            await run_in_threadpool(extract_file_modules.delay, file.id)
         except Exception as e:
-            logger.error(f"Error re-extracting modules from {file.filename}: {e}")
+            logger.error(f"Error queueing module re-extraction for {file.filename}: {e}")
             # Don't fail the file update if module extraction fails
 
     return file
@@ -342,8 +624,8 @@ async def update_project_file(
 async def upload_project_file(
     project_id: int,
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Upload a file from local computer
@@ -352,32 +634,46 @@ async def upload_project_file(
     - Automatically extracts modules from Verilog files
     - Only project owner can upload files
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-
-    if not project:
+    # Determine filepath - use src/ directory by default
+    filename = file.filename or "untitled.v"
+    try:
+        validate_file_path(filename, allow_directories=False)
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid filename: {e}"
         )
+    filepath = f"src/{filename}"
 
-    check_project_access(project, current_user, write_access=True)
+    # Fetch project and any file already at this path in one round trip
+    result = await db.execute(
+        select(Project, ProjectFile.id)
+        .options(load_only(*_PROJECT_ACCESS_COLUMNS))
+        .outerjoin(
+            ProjectFile,
+            and_(ProjectFile.project_id == Project.id, ProjectFile.filepath == filepath)
+        )
+        .where(Project.id == project_id)
+    )
+    project, existing_file_id = result.first() or (None, None)
 
-    # Determine filepath - use src/ directory by default
-    filename = file.filename or "untitled.v"
-    filepath = f"src/{filename}"
+    check_project_access(project, current_user, write_access=True)
 
     # Check if file already exists
-    existing_file = db.query(ProjectFile).filter(
-        ProjectFile.project_id == project_id,
-        ProjectFile.filepath == filepath
-    ).first()
-
-    if existing_file:
+    if existing_file_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File already exists at {filepath}. Please delete it first or rename the file."
         )
 
+    # Reject oversized uploads before reading them into memory
+    max_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File size exceeds maximum allowed ({settings.MAX_FILE_SIZE_MB}MB)"
+        )
+
     # Read file content
     try:
         file_bytes = await file.read()
@@ -390,7 +686,7 @@ async def upload_project_file(
 
     # Check file size limit
     size_bytes = len(file_bytes)
-    if size_bytes > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
+    if size_bytes > max_bytes:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File size exceeds maximum allowed ({settings.MAX_FILE_SIZE_MB}MB)"
@@ -410,12 +706,13 @@ async def upload_project_file(
     )
 
     db.add(new_file)
-    db.commit()
-    db.refresh(new_file)
+    await db.commit()
+    await db.refresh(new_file)
 
     # Upload content to MinIO
     try:
-        bucket, key, content_hash = storage_service.upload_file(
+        bucket, key, content_hash = await run_in_threadpool(
+            storage_service.upload_file,
             file_bytes,
             project_id,
             new_file.id,
@@ -427,34 +724,26 @@ async def upload_project_file(
         new_file.minio_bucket = bucket
         new_file.minio_key = key
         new_file.content_hash = content_hash
-        db.commit()
-        db.refresh(new_file)
+        await db.commit()
+        await db.refresh(new_file)
 
         logger.info(f"Uploaded file {filename} to MinIO: {key}")
     except Exception as e:
         logger.error(f"Error uploading file to MinIO: {e}")
         # Rollback the file creation if upload fails
-        db.delete(new_file)
-        db.commit()
+        await db.delete(new_file)
+        await db.commit()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to upload file to storage"
         )
 
-    # Extract modules from Verilog files
+    # Extract modules from Verilog files in the background
     if filename.endswith(('.v', '.sv', '.vh')):
         try:
-            content_str = file_bytes.decode('utf-8')
-            result = module_extractor.extract_modules_from_file(
-                content_str,
-                new_file.id,
-                project_id,
-                filename,
-                db
-            )
-            logger.info(f"Extracted {result.modules_found} modules from {filename}")
+            await run_in_threadpool(extract_file_modules.delay, new_file.id)
         except Exception as e:
-            logger.error(f"Error extracting modules from {filename}: {e}")
+            logger.error(f"Error queueing module extraction for {filename}: {e}")
             # Don't fail the upload if module extraction fails
 
     return new_file
@@ -464,8 +753,8 @@ async def upload_project_file(
 async def delete_project_file(
     project_id: int,
     file_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete file
@@ -473,37 +762,36 @@ async def delete_project_file(
     - Permanently removes file from project
     - Only project owner can delete files
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
+    # Ownership is part of the WHERE clause, so the delete and the access
+    # check happen in a single statement
+    result = await db.execute(
+        delete(ProjectFile)
+        .where(
+            ProjectFile.id == file_id,
+            ProjectFile.project_id == project_id,
+            ProjectFile.project.has(Project.owner_id == current_user.id)
         )
+        .returning(ProjectFile.filename, ProjectFile.use_minio, ProjectFile.minio_bucket, ProjectFile.minio_key)
+    )
+    file = result.first()
 
-    check_project_access(project, current_user, write_access=True)
-
-    file = db.query(ProjectFile).filter(
-        ProjectFile.id == file_id,
-        ProjectFile.project_id == project_id
-    ).first()
-
-    if not file:
+    if file is None:
+        # Nothing matched; report whether the file is missing or not ours
+        await get_project_file_or_404(db, project_id, file_id, current_user, write_access=True)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found"
         )
 
+    await db.commit()
+
     # Delete from MinIO if file uses it
     if file.use_minio and file.minio_bucket and file.minio_key:
         try:
-            storage_service.delete_file(file.minio_bucket, file.minio_key)
+            await run_in_threadpool(storage_service.delete_file, file.minio_bucket, file.minio_key)
             logger.info(f"Deleted file {file.filename} from MinIO: {file.minio_key}")
         except Exception as e:
             logger.error(f"Error deleting file from MinIO: {e}")
-            # Continue with DB deletion even if MinIO deletion fails
-
-    db.delete(file)
-    db.commit()
+            # The DB row is already gone; an orphaned object is harmless
 
     return None
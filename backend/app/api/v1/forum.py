@@ -2,14 +2,33 @@
 Forum API endpoints
 Handles categories, topics, and posts
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import Select, exists, func, literal, select, true, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from datetime import datetime
 from typing import List, Optional
 import re
-
-from app.core.security import get_current_user, get_optional_user
-from app.db.session import get_db
+import secrets
+
+from app.core.cache import (
+    FORUM_CATEGORIES_VERSION_KEY,
+    TOPIC_VIEWS_VERSION_KEY,
+    buffer_topic_view,
+    cache_delete,
+    cache_get,
+    cache_incr,
+    cache_set,
+    forum_categories_cache_key,
+    forum_topic_cache_key,
+)
+from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from app.core.security import AuthenticatedUser, get_current_user, get_optional_user
+from app.db.session import get_async_db
 from app.models.user import User
 from app.models.forum import ForumCategory, ForumTopic, ForumPost
 from app.schemas.forum import (
@@ -25,53 +44,202 @@ from app.schemas.forum import (
 
 router = APIRouter()
 
+# List endpoints build their response models directly and return the
+# serialized bytes, skipping FastAPI's second response_model validation pass
+_category_list_adapter = TypeAdapter(List[ForumCategoryResponse])
+_topic_list_adapter = TypeAdapter(List[ForumTopicListItem])
+_post_list_adapter = TypeAdapter(List[ForumPostResponse])
+
+# Runs of characters that are not allowed in a slug
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# Inserts tried before giving up on a topic slug taken by concurrent requests
+SLUG_INSERT_ATTEMPTS = 3
+
 
 def generate_slug(text: str) -> str:
     """Generate URL-friendly slug from text"""
-    slug = re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
-    return slug[:100]  # Limit length
+    return _SLUG_RE.sub('-', text.lower()).strip('-')[:100]  # Limit length
+
+
+async def find_available_slug(
+    db: AsyncSession,
+    category_id: int,
+    slug: str,
+    exclude_topic_id: Optional[int] = None
+) -> str:
+    """
+    Find a topic slug that is not yet used in a category
+
+    Fetches every slug in the category that starts with the base slug in a
+    single query, then picks the first free "-N" suffix.
+
+    Args:
+        db: Database session
+        category_id: Category the topic belongs to
+        slug: Base slug generated from the title
+        exclude_topic_id: Topic being renamed, whose own slug doesn't count
+
+    Returns:
+        Available slug
+    """
+    query = select(ForumTopic.slug).where(
+        ForumTopic.category_id == category_id,
+        ForumTopic.slug.like(f"{slug}%")
+    )
+    if exclude_topic_id is not None:
+        query = query.where(ForumTopic.id != exclude_topic_id)
+
+    existing = set((await db.execute(query)).scalars())
+
+    candidate = slug
+    counter = 1
+    while candidate in existing:
+        candidate = f"{slug}-{counter}"
+        counter += 1
+    return candidate
+
+
+async def invalidate_categories_cache():
+    """Move category listings to a new cache version after counts change"""
+    await cache_incr(FORUM_CATEGORIES_VERSION_KEY)
+
+
+async def topic_cache_key(topic_id: int) -> str:
+    """Cache key for a topic's details under the current topic views version"""
+    version = await cache_get(TOPIC_VIEWS_VERSION_KEY)
+    return forum_topic_cache_key(topic_id, int(version or 0))
+
+
+def create_topic_statement(topic_data: ForumTopicCreate, slug: str, author_id: int) -> Select:
+    """
+    Build a single statement that creates a topic with its first post
+
+    The first post's id is drawn from its sequence up front so the topic
+    row can be inserted with first_post_id already set. Data-modifying CTEs
+    then insert the post and bump the category counters, and the statement
+    returns the new topic row, or no row if the slug is already taken.
+    Column defaults are spelled out because nested INSERTs don't apply
+    Python-side defaults.
+
+    Args:
+        topic_data: Topic title, category and first post content
+        slug: Slug to insert the topic under
+        author_id: ID of the user creating the topic
+
+    Returns:
+        Select over the inserted topic
+    """
+    first_post_id = select(
+        func.nextval(func.pg_get_serial_sequence(ForumPost.__tablename__, "id")).label("id")
+    ).cte("first_post_id")
+
+    new_topic = (
+        insert(ForumTopic)
+        .from_select(
+            [
+                "title", "slug", "category_id", "author_id",
+                "is_pinned", "is_locked", "views_count", "post_count", "first_post_id"
+            ],
+            select(
+                literal(topic_data.title),
+                literal(slug),
+                literal(topic_data.category_id),
+                literal(author_id),
+                literal(False),
+                literal(False),
+                literal(0),
+                literal(1),
+                first_post_id.c.id
+            )
+        )
+        .on_conflict_do_nothing(index_elements=[ForumTopic.category_id, ForumTopic.slug])
+        .returning(
+            ForumTopic.id,
+            ForumTopic.title,
+            ForumTopic.slug,
+            ForumTopic.category_id,
+            ForumTopic.author_id,
+            ForumTopic.is_pinned,
+            ForumTopic.is_locked,
+            ForumTopic.views_count,
+            ForumTopic.created_at,
+            ForumTopic.updated_at,
+            ForumTopic.last_post_at
+        )
+        .cte("new_topic")
+    )
+
+    first_post = (
+        insert(ForumPost)
+        .from_select(
+            ["id", "topic_id", "author_id", "content", "is_edited"],
+            select(
+                first_post_id.c.id,
+                new_topic.c.id,
+                literal(author_id),
+                literal(topic_data.content),
+                literal(False)
+            )
+            .select_from(new_topic)
+            .join(first_post_id, true())
+        )
+        .returning(ForumPost.id)
+        .cte("first_post")
+    )
+
+    # Update denormalized counters (as SQL expressions to avoid lost updates)
+    category_counts = (
+        update(ForumCategory)
+        .where(ForumCategory.id == topic_data.category_id, exists(select(new_topic.c.id)))
+        .values(
+            topic_count=ForumCategory.topic_count + 1,
+            post_count=ForumCategory.post_count + 1
+        )
+        .returning(ForumCategory.id)
+        .cte("category_counts")
+    )
+
+    return select(new_topic).add_cte(first_post, category_counts)
+
+
+def slug_conflict() -> HTTPException:
+    """Error for a topic slug taken by concurrent requests"""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="A topic with this title was just created in this category, please retry"
+    )
 
 
 # ==================== Categories ====================
 
 @router.get("/categories", response_model=List[ForumCategoryResponse])
 async def list_categories(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List all forum categories
 
     - Public endpoint, no authentication required
     - Returns categories with topic/post counts
+    - Served from Redis until a topic or post changes the counts
     """
-    categories = db.query(ForumCategory).order_by(ForumCategory.order, ForumCategory.name).all()
+    version = await cache_get(FORUM_CATEGORIES_VERSION_KEY)
+    cache_key = forum_categories_cache_key(int(version or 0))
 
-    # Add computed fields
-    result = []
-    for category in categories:
-        topic_count = db.query(func.count(ForumTopic.id)).filter(
-            ForumTopic.category_id == category.id
-        ).scalar()
-
-        post_count = db.query(func.count(ForumPost.id)).join(ForumTopic).filter(
-            ForumTopic.category_id == category.id
-        ).scalar()
-
-        category_dict = {
-            "id": category.id,
-            "name": category.name,
-            "description": category.description,
-            "slug": category.slug,
-            "order": category.order,
-            "icon": category.icon,
-            "created_at": category.created_at,
-            "updated_at": category.updated_at,
-            "topic_count": topic_count or 0,
-            "post_count": post_count or 0,
-        }
-        result.append(ForumCategoryResponse(**category_dict))
-
-    return result
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    result = await db.execute(
+        select(ForumCategory).order_by(ForumCategory.order, ForumCategory.name)
+    )
+    categories = _category_list_adapter.validate_python(result.scalars().all(), from_attributes=True)
+
+    content = _category_list_adapter.dump_json(categories)
+    await cache_set(cache_key, content, settings.FORUM_CATEGORIES_CACHE_TTL_SECONDS)
+
+    return Response(content=content, media_type="application/json")
 
 
 # ==================== Topics ====================
@@ -79,8 +247,8 @@ async def list_categories(
 @router.post("/topics", response_model=ForumTopicResponse, status_code=status.HTTP_201_CREATED)
 async def create_topic(
     topic_data: ForumTopicCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new forum topic
@@ -89,45 +257,34 @@ async def create_topic(
     - Creates topic and first post
     """
     # Verify category exists
-    category = db.query(ForumCategory).filter(ForumCategory.id == topic_data.category_id).first()
+    category = await db.get(ForumCategory, topic_data.category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
 
-    # Generate slug
-    slug = generate_slug(topic_data.title)
+    # Generate slug, unique within the category
+    base_slug = generate_slug(topic_data.title)
+    slug = await find_available_slug(db, topic_data.category_id, base_slug)
 
-    # Check for duplicate slug in this category
-    counter = 1
-    original_slug = slug
-    while db.query(ForumTopic).filter(
-        ForumTopic.slug == slug,
-        ForumTopic.category_id == topic_data.category_id
-    ).first():
-        slug = f"{original_slug}-{counter}"
-        counter += 1
+    # Create the topic, its first post and the category counter updates in
+    # one statement. ON CONFLICT lets the unique (category_id, slug) index
+    # arbitrate between concurrent requests without aborting the transaction.
+    for _ in range(SLUG_INSERT_ATTEMPTS):
+        result = await db.execute(
+            create_topic_statement(topic_data, slug, current_user.id)
+        )
+        new_topic = result.first()
+        if new_topic is not None:
+            break
+        # Another request took this slug after the check; try a random suffix
+        slug = f"{base_slug}-{secrets.token_hex(3)}"
+    else:
+        raise slug_conflict()
 
-    # Create topic
-    new_topic = ForumTopic(
-        title=topic_data.title,
-        slug=slug,
-        category_id=topic_data.category_id,
-        author_id=current_user.id
-    )
-    db.add(new_topic)
-    db.flush()  # Get topic ID
-
-    # Create first post
-    first_post = ForumPost(
-        content=topic_data.content,
-        topic_id=new_topic.id,
-        author_id=current_user.id
-    )
-    db.add(first_post)
-    db.commit()
-    db.refresh(new_topic)
+    await db.commit()
+    await invalidate_categories_cache()
 
     # Build response with computed fields
     return ForumTopicResponse(
@@ -152,7 +309,8 @@ async def list_topics_in_category(
     category_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List topics in a category
@@ -160,32 +318,44 @@ async def list_topics_in_category(
     - Public endpoint
     - Pinned topics appear first
     - Sorted by last_post_at
+    - Pass the X-Next-Cursor response header back as `cursor` to fetch the
+      next page; `skip` is only used when no cursor is given
     """
     # Verify category exists
-    category = db.query(ForumCategory).filter(ForumCategory.id == category_id).first()
+    category = await db.get(ForumCategory, category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
 
-    topics = (
-        db.query(ForumTopic)
-        .filter(ForumTopic.category_id == category_id)
-        .order_by(ForumTopic.is_pinned.desc(), ForumTopic.last_post_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    query = (
+        select(ForumTopic)
+        .options(joinedload(ForumTopic.author))
+        .where(ForumTopic.category_id == category_id)
+        .order_by(ForumTopic.is_pinned.desc(), ForumTopic.last_post_at.desc(), ForumTopic.id.desc())
     )
 
-    # Build response with computed fields
+    if cursor:
+        # Seek past the last topic of the previous page
+        key = decode_cursor(cursor, bool, datetime, int)
+        query = query.where(tuple_(ForumTopic.is_pinned, ForumTopic.last_post_at, ForumTopic.id) < key)
+    else:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether there is a next page
+    topics = (await db.execute(query.limit(limit + 1))).scalars().all()
+    headers = {}
+    if len(topics) > limit:
+        topics = topics[:limit]
+        last = topics[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.is_pinned, last.last_post_at, last.id)
+
+    # Build response with computed fields; the rows come straight from the
+    # database, so skip re-validating them
     result = []
     for topic in topics:
-        post_count = db.query(func.count(ForumPost.id)).filter(
-            ForumPost.topic_id == topic.id
-        ).scalar()
-
-        result.append(ForumTopicListItem(
+        result.append(ForumTopicListItem.model_construct(
             id=topic.id,
             title=topic.title,
             slug=topic.slug,
@@ -195,61 +365,100 @@ async def list_topics_in_category(
             is_pinned=topic.is_pinned,
             is_locked=topic.is_locked,
             views_count=topic.views_count,
-            post_count=post_count or 0,
+            post_count=topic.post_count,
             created_at=topic.created_at,
             last_post_at=topic.last_post_at
         ))
 
-    return result
+    return Response(content=_topic_list_adapter.dump_json(result), media_type="application/json", headers=headers)
 
 
 @router.get("/topics/{topic_id}", response_model=ForumTopicResponse)
 async def get_topic(
     topic_id: int,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[AuthenticatedUser] = Depends(get_optional_user)
 ):
     """
     Get topic details
 
     - Public endpoint
-    - Increments view count
+    - Increments view count (buffered in Redis)
     """
-    topic = db.query(ForumTopic).filter(ForumTopic.id == topic_id).first()
-
-    if not topic:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Topic not found"
+    # Topic details are cached without the views still buffered in Redis.
+    # The key changes with every flush, so a row read before a flush
+    # committed is never served after it
+    cache_key = await topic_cache_key(topic_id)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        topic = ForumTopicResponse.model_validate_json(cached)
+    else:
+        # Fetch the topic with its category and author names in one query
+        category_name_query = (
+            select(ForumCategory.name)
+            .where(ForumCategory.id == ForumTopic.category_id)
+            .scalar_subquery()
+        )
+        author_username_query = (
+            select(User.username)
+            .where(User.id == ForumTopic.author_id)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(ForumTopic, category_name_query, author_username_query)
+            .where(ForumTopic.id == topic_id)
+        )
+        row = result.first()
+
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Topic not found"
+            )
+
+        topic_row, category_name, author_username = row
+        topic = ForumTopicResponse(
+            id=topic_row.id,
+            title=topic_row.title,
+            slug=topic_row.slug,
+            category_id=topic_row.category_id,
+            category_name=category_name,
+            author_id=topic_row.author_id,
+            author_username=author_username,
+            is_pinned=topic_row.is_pinned,
+            is_locked=topic_row.is_locked,
+            views_count=topic_row.views_count,
+            created_at=topic_row.created_at,
+            updated_at=topic_row.updated_at,
+            last_post_at=topic_row.last_post_at
+        )
+        await cache_set(cache_key, topic.model_dump_json().encode(), settings.FORUM_TOPIC_CACHE_TTL_SECONDS)
+
+    # Buffer the view in Redis; a periodic worker task adds buffered views
+    # to the database, so the response adds the ones still pending
+    pending_views = await buffer_topic_view(topic_id)
+    if pending_views is not None:
+        views_count = topic.views_count + pending_views
+    else:
+        # Redis unavailable: write the view straight to the database
+        views_count = await db.scalar(
+            update(ForumTopic)
+            .where(ForumTopic.id == topic_id)
+            .values(views_count=ForumTopic.views_count + 1)
+            .returning(ForumTopic.views_count)
+            .execution_options(synchronize_session=False)
         )
+        await db.commit()
 
-    # Increment view count
-    topic.views_count += 1
-    db.commit()
-
-    return ForumTopicResponse(
-        id=topic.id,
-        title=topic.title,
-        slug=topic.slug,
-        category_id=topic.category_id,
-        category_name=topic.category.name,
-        author_id=topic.author_id,
-        author_username=topic.author.username,
-        is_pinned=topic.is_pinned,
-        is_locked=topic.is_locked,
-        views_count=topic.views_count,
-        created_at=topic.created_at,
-        updated_at=topic.updated_at,
-        last_post_at=topic.last_post_at
-    )
+    return topic.model_copy(update={"views_count": views_count})
 
 
 @router.put("/topics/{topic_id}", response_model=ForumTopicResponse)
 async def update_topic(
     topic_id: int,
     topic_data: ForumTopicUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update topic
@@ -257,7 +466,12 @@ async def update_topic(
     - Only topic author can update title
     - Admins can update is_pinned and is_locked
     """
-    topic = db.query(ForumTopic).filter(ForumTopic.id == topic_id).first()
+    result = await db.execute(
+        select(ForumTopic)
+        .options(joinedload(ForumTopic.category))
+        .where(ForumTopic.id == topic_id)
+    )
+    topic = result.scalar_one_or_none()
 
     if not topic:
         raise HTTPException(
@@ -275,7 +489,9 @@ async def update_topic(
     # Update fields
     if topic_data.title is not None:
         topic.title = topic_data.title
-        topic.slug = generate_slug(topic_data.title)
+        topic.slug = await find_available_slug(
+            db, topic.category_id, generate_slug(topic_data.title), exclude_topic_id=topic.id
+        )
 
     if topic_data.is_pinned is not None:
         topic.is_pinned = topic_data.is_pinned
@@ -283,17 +499,25 @@ async def update_topic(
     if topic_data.is_locked is not None:
         topic.is_locked = topic_data.is_locked
 
-    db.commit()
-    db.refresh(topic)
+    # Read eager-loaded category name before the refresh expires it
+    category_name = topic.category.name
+
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise slug_conflict()
+    await db.refresh(topic)
+    await cache_delete(await topic_cache_key(topic_id))
 
     return ForumTopicResponse(
         id=topic.id,
         title=topic.title,
         slug=topic.slug,
         category_id=topic.category_id,
-        category_name=topic.category.name,
+        category_name=category_name,
         author_id=topic.author_id,
-        author_username=topic.author.username,
+        author_username=current_user.username,
         is_pinned=topic.is_pinned,
         is_locked=topic.is_locked,
         views_count=topic.views_count,
@@ -306,15 +530,15 @@ async def update_topic(
 @router.delete("/topics/{topic_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_topic(
     topic_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete topic
 
     - Only topic author can delete
     """
-    topic = db.query(ForumTopic).filter(ForumTopic.id == topic_id).first()
+    topic = await db.get(ForumTopic, topic_id)
 
     if not topic:
         raise HTTPException(
@@ -328,8 +552,21 @@ async def delete_topic(
             detail="Only topic author can delete"
         )
 
-    db.delete(topic)
-    db.commit()
+    # Update denormalized category counters
+    await db.execute(
+        update(ForumCategory)
+        .where(ForumCategory.id == topic.category_id)
+        .values(
+            topic_count=ForumCategory.topic_count - 1,
+            post_count=ForumCategory.post_count - topic.post_count
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    await db.delete(topic)
+    await db.commit()
+    await invalidate_categories_cache()
+    await cache_delete(await topic_cache_key(topic_id))
 
     return None
 
@@ -341,34 +578,51 @@ async def list_posts_in_topic(
     topic_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List posts in a topic
 
     - Public endpoint
     - Sorted by created_at
+    - Pass the X-Next-Cursor response header back as `cursor` to fetch the
+      next page; `skip` is only used when no cursor is given
     """
     # Verify topic exists
-    topic = db.query(ForumTopic).filter(ForumTopic.id == topic_id).first()
+    topic = await db.get(ForumTopic, topic_id)
     if not topic:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Topic not found"
         )
 
-    posts = (
-        db.query(ForumPost)
-        .filter(ForumPost.topic_id == topic_id)
-        .order_by(ForumPost.created_at.asc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    query = (
+        select(ForumPost)
+        .options(joinedload(ForumPost.author))
+        .where(ForumPost.topic_id == topic_id)
+        .order_by(ForumPost.created_at.asc(), ForumPost.id.asc())
     )
 
-    # Build response with computed fields
-    return [
-        ForumPostResponse(
+    if cursor:
+        # Seek past the last post of the previous page
+        key = decode_cursor(cursor, datetime, int)
+        query = query.where(tuple_(ForumPost.created_at, ForumPost.id) > key)
+    else:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether there is a next page
+    posts = (await db.execute(query.limit(limit + 1))).scalars().all()
+    headers = {}
+    if len(posts) > limit:
+        posts = posts[:limit]
+        last = posts[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+
+    # Build response with computed fields; the rows come straight from the
+    # database, so skip re-validating them
+    result = [
+        ForumPostResponse.model_construct(
             id=post.id,
             content=post.content,
             topic_id=post.topic_id,
@@ -382,13 +636,15 @@ async def list_posts_in_topic(
         for post in posts
     ]
 
+    return Response(content=_post_list_adapter.dump_json(result), media_type="application/json", headers=headers)
+
 
 @router.post("/topics/{topic_id}/posts", response_model=ForumPostResponse, status_code=status.HTTP_201_CREATED)
 async def create_post(
     topic_id: int,
     post_data: ForumPostCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new post in a topic
@@ -396,34 +652,58 @@ async def create_post(
     - Requires authentication
     - Cannot post to locked topics
     """
-    # Verify topic exists
-    topic = db.query(ForumTopic).filter(ForumTopic.id == topic_id).first()
-    if not topic:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Topic not found"
+    # Bump the topic's last_post_at and counters (skipping locked topics),
+    # bump the category counter and insert the post in one statement
+    updated_topic = (
+        update(ForumTopic)
+        .where(ForumTopic.id == topic_id, ForumTopic.is_locked.isnot(True))
+        .values(last_post_at=func.now(), post_count=ForumTopic.post_count + 1)
+        .returning(ForumTopic.id, ForumTopic.category_id)
+        .cte("updated_topic")
+    )
+    updated_category = (
+        update(ForumCategory)
+        .where(ForumCategory.id == updated_topic.c.category_id)
+        .values(post_count=ForumCategory.post_count + 1)
+        .returning(ForumCategory.id)
+        .cte("updated_category")
+    )
+    result = await db.execute(
+        insert(ForumPost)
+        .from_select(
+            ["topic_id", "author_id", "content", "is_edited"],
+            select(updated_topic.c.id, literal(current_user.id), literal(post_data.content), literal(False))
         )
-
-    # Check if topic is locked
-    if topic.is_locked:
+        .returning(
+            ForumPost.id,
+            ForumPost.content,
+            ForumPost.topic_id,
+            ForumPost.author_id,
+            ForumPost.is_edited,
+            ForumPost.edited_at,
+            ForumPost.created_at,
+            ForumPost.updated_at
+        )
+        .add_cte(updated_category)
+    )
+    new_post = result.first()
+
+    if new_post is None:
+        # Nothing was inserted: the topic is missing or locked
+        is_locked = await db.scalar(select(ForumTopic.is_locked).where(ForumTopic.id == topic_id))
+        if is_locked is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Topic not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cannot post to locked topic"
         )
 
-    # Create post
-    new_post = ForumPost(
-        content=post_data.content,
-        topic_id=topic_id,
-        author_id=current_user.id
-    )
-    db.add(new_post)
-
-    # Update topic's last_post_at
-    topic.last_post_at = func.now()
-
-    db.commit()
-    db.refresh(new_post)
+    await db.commit()
+    await invalidate_categories_cache()
+    await cache_delete(await topic_cache_key(topic_id))
 
     return ForumPostResponse(
         id=new_post.id,
@@ -442,15 +722,15 @@ async def create_post(
 async def update_post(
     post_id: int,
     post_data: ForumPostUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a post
 
     - Only post author can update
     """
-    post = db.query(ForumPost).filter(ForumPost.id == post_id).first()
+    post = await db.get(ForumPost, post_id)
 
     if not post:
         raise HTTPException(
@@ -469,15 +749,15 @@ async def update_post(
     post.is_edited = True
     post.edited_at = func.now()
 
-    db.commit()
-    db.refresh(post)
+    await db.commit()
+    await db.refresh(post)
 
     return ForumPostResponse(
         id=post.id,
         content=post.content,
         topic_id=post.topic_id,
         author_id=post.author_id,
-        author_username=post.author.username,
+        author_username=current_user.username,
         is_edited=post.is_edited,
         edited_at=post.edited_at,
         created_at=post.created_at,
@@ -488,8 +768,8 @@ async def update_post(
 @router.delete("/posts/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_post(
     post_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a post
@@ -497,14 +777,21 @@ async def delete_post(
     - Only post author can delete
     - Cannot delete first post (must delete topic instead)
     """
-    post = db.query(ForumPost).filter(ForumPost.id == post_id).first()
+    result = await db.execute(
+        select(ForumPost, ForumTopic.first_post_id)
+        .join(ForumTopic, ForumTopic.id == ForumPost.topic_id)
+        .where(ForumPost.id == post_id)
+    )
+    row = result.first()
 
-    if not post:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
 
+    post, first_post_id = row
+
     if post.author_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -512,20 +799,29 @@ async def delete_post(
         )
 
     # Check if this is the first post
-    first_post = (
-        db.query(ForumPost)
-        .filter(ForumPost.topic_id == post.topic_id)
-        .order_by(ForumPost.created_at.asc())
-        .first()
-    )
-
-    if first_post.id == post.id:
+    if first_post_id == post.id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete first post. Delete the topic instead."
         )
 
-    db.delete(post)
-    db.commit()
+    # Update denormalized counters
+    await db.execute(
+        update(ForumTopic)
+        .where(ForumTopic.id == post.topic_id)
+        .values(post_count=ForumTopic.post_count - 1)
+        .execution_options(synchronize_session=False)
+    )
+    topic_category_id = select(ForumTopic.category_id).where(ForumTopic.id == post.topic_id).scalar_subquery()
+    await db.execute(
+        update(ForumCategory)
+        .where(ForumCategory.id == topic_category_id)
+        .values(post_count=ForumCategory.post_count - 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    await db.delete(post)
+    await db.commit()
+    await invalidate_categories_cache()
 
     return None
@@ -2,13 +2,19 @@
 Jobs API endpoints
 Handles creation and management of build/simulation jobs
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select, update, and_, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from datetime import datetime
+from typing import List, Optional
 
-from app.core.security import get_current_user
-from app.db.session import get_db
-from app.models.user import User
+from app.core.cache import build_status_cache_key, cache_delete
+from app.core.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from app.core.security import AuthenticatedUser, get_current_user
+from app.db.session import get_async_db
 from app.models.project import Project, ProjectVisibility
 from app.models.job import Job, JobStatus, JobType
 from app.schemas.job import (
@@ -20,8 +26,10 @@ from app.schemas.job import (
 
 router = APIRouter()
 
+_job_list_adapter = TypeAdapter(List[JobListItem])
 
-def check_project_access(project: Project, user: User):
+
+def check_project_access(project: Project, user: AuthenticatedUser):
     """Check if user has access to project"""
     if project.owner_id != user.id and project.visibility != ProjectVisibility.PUBLIC:
         raise HTTPException(
@@ -30,12 +38,43 @@ def check_project_access(project: Project, user: User):
         )
 
 
+async def get_project_job_row(db: AsyncSession, project_id: int, job_id: int) -> Row:
+    """
+    Fetch a job together with its project's access columns in one query
+
+    Args:
+        db: Database session
+        project_id: Project ID
+        job_id: Job ID
+
+    Returns:
+        Row with owner_id, visibility and Job (None if the project has no such job)
+
+    Raises:
+        HTTPException: If the project doesn't exist
+    """
+    result = await db.execute(
+        select(Project.owner_id, Project.visibility, Job)
+        .outerjoin(Job, and_(Job.project_id == Project.id, Job.id == job_id))
+        .where(Project.id == project_id)
+    )
+    row = result.first()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+    return row
+
+
 @router.post("/{project_id}/jobs", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
 async def create_job(
     project_id: int,
     job_data: JobCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new job
@@ -44,7 +83,7 @@ async def create_job(
     - Job is queued for execution by Celery workers
     - Only project owner can create jobs
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     
     if not project:
         raise HTTPException(
@@ -69,8 +108,8 @@ async def create_job(
     )
     
     db.add(new_job)
-    db.commit()
-    db.refresh(new_job)
+    await db.commit()
+    await db.refresh(new_job)
     
     # TODO: Queue job in Celery
     # task = execute_job.delay(new_job.id)
@@ -83,16 +122,23 @@ async def create_job(
 @router.get("/{project_id}/jobs", response_model=List[JobListItem])
 async def list_project_jobs(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    List all jobs for a project
+    List jobs for a project, newest first
     
     - Returns list of jobs with basic info
     - User must have read access to project
+    - Pass the X-Next-Cursor response header back as `cursor` to fetch the
+      next page
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    result = await db.execute(
+        select(Project.owner_id, Project.visibility).where(Project.id == project_id)
+    )
+    project = result.first()
     
     if not project:
         raise HTTPException(
@@ -102,22 +148,40 @@ async def list_project_jobs(
     
     check_project_access(project, current_user)
     
-    jobs = (
-        db.query(Job)
-        .filter(Job.project_id == project_id)
-        .order_by(Job.created_at.desc())
-        .all()
+    # Only the listed columns; logs and config can be large
+    query = (
+        select(Job)
+        .options(load_only(
+            Job.id, Job.job_type, Job.status, Job.project_id, Job.created_at, Job.completed_at
+        ))
+        .where(Job.project_id == project_id)
+        .order_by(Job.created_at.desc(), Job.id.desc())
     )
     
-    return jobs
+    if cursor:
+        # Seek past the last job of the previous page
+        key = decode_cursor(cursor, datetime, int)
+        query = query.where(tuple_(Job.created_at, Job.id) < key)
+    
+    # Fetch one extra row to know whether there is a next page
+    jobs = (await db.execute(query.limit(limit + 1))).scalars().all()
+    headers = {}
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        last = jobs[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    
+    items = _job_list_adapter.validate_python(jobs, from_attributes=True)
+    
+    return Response(content=_job_list_adapter.dump_json(items), media_type="application/json", headers=headers)
 
 
 @router.get("/{project_id}/jobs/{job_id}", response_model=JobResponse)
 async def get_job(
     project_id: int,
     job_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get job details
@@ -125,20 +189,10 @@ async def get_job(
     - Returns full job information including logs
     - User must have read access to project
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    row = await get_project_job_row(db, project_id, job_id)
+    check_project_access(row, current_user)
     
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-    
-    check_project_access(project, current_user)
-    
-    job = db.query(Job).filter(
-        Job.id == job_id,
-        Job.project_id == project_id
-    ).first()
+    job = row.Job
     
     if not job:
         raise HTTPException(
@@ -153,8 +207,8 @@ async def get_job(
 async def get_job_logs(
     project_id: int,
     job_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get job logs
@@ -162,20 +216,10 @@ async def get_job_logs(
     - Returns current job logs and status
     - User must have read access to project
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-    
-    check_project_access(project, current_user)
+    row = await get_project_job_row(db, project_id, job_id)
+    check_project_access(row, current_user)
     
-    job = db.query(Job).filter(
-        Job.id == job_id,
-        Job.project_id == project_id
-    ).first()
+    job = row.Job
     
     if not job:
         raise HTTPException(
@@ -196,8 +240,8 @@ async def get_job_logs(
 async def cancel_job(
     project_id: int,
     job_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Cancel a running job
@@ -205,46 +249,53 @@ async def cancel_job(
     - Stops job execution if still running
     - Only project owner can cancel jobs
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    owner_id = await db.scalar(select(Project.owner_id).where(Project.id == project_id))
     
-    if not project:
+    if owner_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
     # Only owner can cancel jobs
-    if project.owner_id != current_user.id:
+    if owner_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only project owner can cancel jobs"
         )
     
-    job = db.query(Job).filter(
-        Job.id == job_id,
-        Job.project_id == project_id
-    ).first()
-    
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found"
+    # Can only cancel pending or running jobs; the status filter makes the
+    # check and the update a single atomic statement
+    result = await db.execute(
+        update(Job)
+        .where(
+            Job.id == job_id,
+            Job.project_id == project_id,
+            Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING])
         )
+        .values(status=JobStatus.CANCELLED)
+        .execution_options(synchronize_session=False)
+    )
     
-    # Can only cancel pending or running jobs
-    if job.status not in [JobStatus.PENDING, JobStatus.RUNNING]:
+    if result.rowcount == 0:
+        job_exists = await db.scalar(
+            select(Job.id).where(Job.id == job_id, Job.project_id == project_id)
+        )
+        if job_exists is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Job is not running"
         )
     
-    # Update job status
-    job.status = JobStatus.CANCELLED
-    
     # TODO: Cancel Celery task
     # if job.celery_task_id:
     #     celery_app.control.revoke(job.celery_task_id, terminate=True)
     
-    db.commit()
+    await db.commit()
+    await cache_delete(build_status_cache_key(project_id))
     
     return None
@@ -3,13 +3,18 @@ Modules API endpoints
 
 Handles CRUD operations for design modules extracted from files.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import and_, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
 from typing import List, Optional
+import logging
 
-from app.core.security import get_current_user
-from app.db.session import get_db
-from app.models.user import User
+from app.core.etag import check_etag, row_etag
+from app.core.security import AuthenticatedUser, get_current_user, get_current_user_sync
+from app.db.session import get_async_db, get_db
 from app.models.project import Project, ProjectVisibility
 from app.models.module import Module, ModuleType
 from app.models.project_file import ProjectFile
@@ -21,12 +26,36 @@ from app.schemas.module import (
     ModuleUpdate
 )
 from app.services.module_extractor import module_extractor
+from app.services.storage import storage_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Module listings are validated once from row attributes and returned as
+# serialized bytes, skipping FastAPI's second response_model pass
+_module_list_adapter = TypeAdapter(List[ModuleWithFile])
+
+# Columns of a module listing row: the module plus its file's name and path
+_MODULE_LIST_COLUMNS = (
+    Module.id,
+    Module.name,
+    Module.module_type,
+    Module.module_metadata,
+    Module.start_line,
+    Module.end_line,
+    Module.description,
+    Module.file_id,
+    Module.project_id,
+    Module.created_at,
+    Module.updated_at,
+    func.coalesce(ProjectFile.filename, "unknown").label("filename"),
+    func.coalesce(ProjectFile.filepath, "").label("filepath"),
+)
+
 
-def check_project_access(project: Project, user: User):
-    """Check if user has access to project"""
+def check_project_access(project: Project, user: AuthenticatedUser):
+    """Check if user has access to project (or a row with its owner_id and visibility)"""
     if project.owner_id != user.id and project.visibility != ProjectVisibility.PUBLIC:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -34,13 +63,44 @@ def check_project_access(project: Project, user: User):
         )
 
 
+async def get_project_module_row(db: AsyncSession, project_id: int, module_id: int) -> Row:
+    """
+    Fetch a module together with its project's access columns in one query
+
+    Args:
+        db: Database session
+        project_id: Project ID
+        module_id: Module ID
+
+    Returns:
+        Row with owner_id, visibility and Module (None if the project has no such module)
+
+    Raises:
+        HTTPException: If the project doesn't exist
+    """
+    result = await db.execute(
+        select(Project.owner_id, Project.visibility, Module)
+        .outerjoin(Module, and_(Module.project_id == Project.id, Module.id == module_id))
+        .where(Project.id == project_id)
+    )
+    row = result.first()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+    return row
+
+
 @router.get("/{project_id}/modules", response_model=List[ModuleWithFile])
 async def list_project_modules(
     project_id: int,
     module_type: Optional[ModuleType] = None,
     search: Optional[str] = Query(None, description="Search by module name"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List all modules in a project
@@ -49,8 +109,11 @@ async def list_project_modules(
     - Search by module name
     - Returns modules with file information
     """
-    # Get project
-    project = db.query(Project).filter(Project.id == project_id).first()
+    # Get project access columns
+    result = await db.execute(
+        select(Project.owner_id, Project.visibility).where(Project.id == project_id)
+    )
+    project = result.first()
 
     if not project:
         raise HTTPException(
@@ -60,63 +123,55 @@ async def list_project_modules(
 
     check_project_access(project, current_user)
 
-    # Build query
-    query = db.query(Module).filter(Module.project_id == project_id)
+    # Select just the response columns, with file info joined in
+    query = (
+        select(*_MODULE_LIST_COLUMNS)
+        .outerjoin(ProjectFile, ProjectFile.id == Module.file_id)
+        .where(Module.project_id == project_id)
+    )
 
     if module_type:
-        query = query.filter(Module.module_type == module_type)
+        query = query.where(Module.module_type == module_type)
 
     if search:
-        query = query.filter(Module.name.ilike(f"%{search}%"))
-
-    modules = query.order_by(Module.name).all()
+        query = query.where(Module.name.ilike(f"%{search}%"))
 
-    # Add file information
-    result = []
-    for module in modules:
-        module_dict = {
-            **module.__dict__,
-            "filename": module.file.filename if module.file else "unknown",
-            "filepath": module.file.filepath if module.file else ""
-        }
-        result.append(ModuleWithFile.model_validate(module_dict))
+    result = await db.execute(query.order_by(Module.name))
+    modules = _module_list_adapter.validate_python(result.all(), from_attributes=True)
 
-    return result
+    return Response(content=_module_list_adapter.dump_json(modules), media_type="application/json")
 
 
 @router.get("/{project_id}/modules/{module_id}", response_model=ModuleResponse)
 async def get_module(
     project_id: int,
     module_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get module details
 
     - Returns full module information including metadata
+    - Returns 304 Not Modified when If-None-Match holds the current ETag
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    row = await get_project_module_row(db, project_id, module_id)
 
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-
-    check_project_access(project, current_user)
-
-    module = db.query(Module).filter(
-        Module.id == module_id,
-        Module.project_id == project_id
-    ).first()
+    check_project_access(row, current_user)
 
+    module = row.Module
     if not module:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Module not found"
         )
 
+    not_modified = check_etag(request, response, row_etag(module))
+    if not_modified is not None:
+        return not_modified
+
     return module
 
 
@@ -125,8 +180,8 @@ async def update_module(
     project_id: int,
     module_id: int,
     module_update: ModuleUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update module information
@@ -134,26 +189,16 @@ async def update_module(
     - Only owner can update modules
     - Can update name, description, metadata
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
+    row = await get_project_module_row(db, project_id, module_id)
 
     # Only owner can update
-    if project.owner_id != current_user.id:
+    if row.owner_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only project owner can update modules"
         )
 
-    module = db.query(Module).filter(
-        Module.id == module_id,
-        Module.project_id == project_id
-    ).first()
-
+    module = row.Module
     if not module:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -170,8 +215,8 @@ async def update_module(
     if module_update.module_metadata is not None:
         module.module_metadata = module_update.module_metadata
 
-    db.commit()
-    db.refresh(module)
+    # updated_at comes back in the UPDATE's RETURNING clause (eager_defaults)
+    await db.commit()
 
     return module
 
@@ -180,8 +225,8 @@ async def update_module(
 async def delete_module(
     project_id: int,
     module_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a module
@@ -189,42 +234,32 @@ async def delete_module(
     - Only owner can delete modules
     - Note: Modules are usually auto-regenerated when file is saved
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
+    row = await get_project_module_row(db, project_id, module_id)
 
     # Only owner can delete
-    if project.owner_id != current_user.id:
+    if row.owner_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only project owner can delete modules"
         )
 
-    module = db.query(Module).filter(
-        Module.id == module_id,
-        Module.project_id == project_id
-    ).first()
-
+    module = row.Module
     if not module:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Module not found"
         )
 
-    db.delete(module)
-    db.commit()
+    await db.delete(module)
+    await db.commit()
 
     return None
 
 
 @router.post("/{project_id}/modules/reparse", response_model=ModuleParseResult)
-async def reparse_project_modules(
+def reparse_project_modules(
     project_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user_sync),
     db: Session = Depends(get_db)
 ):
     """
@@ -233,6 +268,7 @@ async def reparse_project_modules(
     - Useful after updating parser or for bulk operations
     - Deletes existing modules and re-extracts from source files
     - Only owner can trigger re-parsing
+    - Plain def: the module extractor uses a sync session, so this runs in the threadpool
     """
     project = db.query(Project).filter(Project.id == project_id).first()
 
@@ -256,10 +292,10 @@ async def reparse_project_modules(
 
 
 @router.post("/{project_id}/files/{file_id}/parse", response_model=ModuleParseResult)
-async def parse_file_modules(
+def parse_file_modules(
     project_id: int,
     file_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user_sync),
     db: Session = Depends(get_db)
 ):
     """
@@ -268,27 +304,29 @@ async def parse_file_modules(
     - Useful for re-parsing a single file after editing
     - Deletes existing modules for this file and re-extracts
     - Only owner can trigger parsing
+    - Plain def: the module extractor uses a sync session, so this runs in the threadpool
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    # Fetch the project's owner and the file in one query
+    row = db.query(Project.owner_id, ProjectFile).outerjoin(
+        ProjectFile,
+        and_(ProjectFile.project_id == Project.id, ProjectFile.id == file_id)
+    ).options(undefer(ProjectFile.content)).filter(Project.id == project_id).first()
 
-    if not project:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
 
+    owner_id, file = row
+
     # Only owner can parse
-    if project.owner_id != current_user.id:
+    if owner_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only project owner can parse files"
         )
 
-    file = db.query(ProjectFile).filter(
-        ProjectFile.id == file_id,
-        ProjectFile.project_id == project_id
-    ).first()
-
     if not file:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -298,11 +336,14 @@ async def parse_file_modules(
     # Get file content
     file_content = None
     if file.use_minio and file.minio_bucket and file.minio_key:
-        # TODO: Download from MinIO
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="MinIO download not yet implemented"
-        )
+        try:
+            file_content = storage_service.download_file(file.minio_bucket, file.minio_key).decode('utf-8')
+        except Exception as e:
+            logger.error(f"Error downloading file from MinIO: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to retrieve file content from storage"
+            )
     elif file.content:
         file_content = file.content
     else:
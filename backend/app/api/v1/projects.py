@@ -2,14 +2,30 @@
 Projects API endpoints
 Handles project creation, listing, updates, and deletion
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional
+from functools import lru_cache
 import re
 
-from app.core.security import get_current_user
-from app.db.session import get_db
-from app.models.user import User
+from app.core.cache import (
+    PUBLIC_PROJECTS_VERSION_KEY,
+    cache_delete,
+    cache_get,
+    cache_incr,
+    cache_set,
+    project_access_cache_key,
+    public_projects_cache_key,
+)
+from app.core.config import settings
+from app.core.etag import check_etag, row_etag
+from app.core.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from app.core.security import AuthenticatedUser, get_current_user
+from app.db.session import get_async_db
 from app.models.project import Project, ProjectVisibility
 from app.schemas.project import (
     ProjectCreate,
@@ -20,20 +36,66 @@ from app.schemas.project import (
 
 router = APIRouter()
 
+_project_list_adapter = TypeAdapter(List[ProjectListItem])
+
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
 
+@lru_cache(maxsize=1024)
 def generate_slug(name: str, user_id: int) -> str:
     """Generate URL-friendly slug from project name"""
     # Convert to lowercase and replace spaces/special chars with hyphens
-    slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+    slug = _SLUG_RE.sub('-', name.lower()).strip('-')
     # Add user_id to ensure uniqueness
     return f"{slug}-{user_id}"
 
 
+def require_project(owner_action: Optional[str] = None):
+    """
+    Build a dependency that loads the project named by the path's project_id
+
+    Args:
+        owner_action: Verb for owner-only endpoints ("update", "delete");
+            None allows anyone who can view the project
+
+    Returns:
+        Dependency returning the Project, loaded in the request's session
+    """
+    async def dependency(
+        project_id: int,
+        current_user: AuthenticatedUser = Depends(get_current_user),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> Project:
+        project = await db.get(Project, project_id)
+
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+
+        if owner_action is not None:
+            if project.owner_id != current_user.id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=f"Only project owner can {owner_action}"
+                )
+        elif project.owner_id != current_user.id and project.visibility != ProjectVisibility.PUBLIC:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
+            )
+
+        return project
+
+    return dependency
+
+
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(
     project_data: ProjectCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new project
@@ -41,30 +103,33 @@ async def create_project(
     - Creates project with Git repository
     - Associates with current user as owner
     """
-    # Generate unique slug
-    slug = generate_slug(project_data.name, current_user.id)
+    # Insert unless the slug is taken; RETURNING gives back the full row,
+    # including server defaults, in the same round-trip
+    new_project = await db.scalar(
+        insert(Project)
+        .values(
+            name=project_data.name,
+            slug=generate_slug(project_data.name, current_user.id),
+            description=project_data.description,
+            visibility=project_data.visibility,
+            git_branch=project_data.git_branch,
+            owner_id=current_user.id
+        )
+        .on_conflict_do_nothing(index_elements=[Project.slug])
+        .returning(Project)
+    )
     
-    # Check if slug already exists
-    existing_project = db.query(Project).filter(Project.slug == slug).first()
-    if existing_project:
+    if new_project is None:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Project with this name already exists"
         )
     
-    # Create new project
-    new_project = Project(
-        name=project_data.name,
-        slug=slug,
-        description=project_data.description,
-        visibility=project_data.visibility,
-        git_branch=project_data.git_branch,
-        owner_id=current_user.id
-    )
+    await db.commit()
     
-    db.add(new_project)
-    db.commit()
-    db.refresh(new_project)
+    if new_project.visibility == ProjectVisibility.PUBLIC:
+        await cache_incr(PUBLIC_PROJECTS_VERSION_KEY)
     
     return new_project
 
@@ -73,31 +138,54 @@ async def create_project(
 async def list_projects(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     visibility: ProjectVisibility = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List user's projects
     
-    - Returns paginated list of projects owned by current user
+    - Returns paginated list of projects owned by current user, newest first
     - Optionally filter by visibility
+    - Pass the X-Next-Cursor response header back as `cursor` to fetch the
+      next page; `skip` is only used when no cursor is given
     """
-    query = db.query(Project).filter(Project.owner_id == current_user.id)
+    query = (
+        select(Project)
+        .where(Project.owner_id == current_user.id)
+        .order_by(Project.created_at.desc(), Project.id.desc())
+    )
     
     if visibility:
-        query = query.filter(Project.visibility == visibility)
+        query = query.where(Project.visibility == visibility)
+    
+    if cursor:
+        # Seek past the last project of the previous page
+        key = decode_cursor(cursor, datetime, int)
+        query = query.where(tuple_(Project.created_at, Project.id) < key)
+    else:
+        query = query.offset(skip)
     
-    projects = query.order_by(Project.created_at.desc()).offset(skip).limit(limit).all()
+    # Fetch one extra row to know whether there is a next page
+    projects = (await db.execute(query.limit(limit + 1))).scalars().all()
+    headers = {}
+    if len(projects) > limit:
+        projects = projects[:limit]
+        last = projects[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
     
-    return projects
+    items = _project_list_adapter.validate_python(projects, from_attributes=True)
+    
+    return Response(content=_project_list_adapter.dump_json(items), media_type="application/json", headers=headers)
 
 
 @router.get("/public", response_model=List[ProjectListItem])
 async def list_public_projects(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List all public projects
@@ -105,55 +193,86 @@ async def list_public_projects(
     - Returns paginated list of public projects from all users
     - Sorted by popularity (stars_count, then views_count)
     - No authentication required
+    - Pass the X-Next-Cursor response header back as `cursor` to fetch the
+      next page; `skip` is only used when no cursor is given
+    - Served from Redis until a public project changes
     """
-    projects = (
-        db.query(Project)
-        .filter(Project.visibility == ProjectVisibility.PUBLIC)
-        .order_by(Project.stars_count.desc(), Project.views_count.desc(), Project.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    version = await cache_get(PUBLIC_PROJECTS_VERSION_KEY)
+    cache_key = public_projects_cache_key(int(version or 0), skip, limit, cursor)
+
+    # Cached as "<next cursor>\n<JSON body>"; the compact JSON has no newlines
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        next_cursor, _, content = cached.partition(b"\n")
+        headers = {NEXT_CURSOR_HEADER: next_cursor.decode("ascii")} if next_cursor else {}
+        return Response(content=content, media_type="application/json", headers=headers)
+
+    query = (
+        select(Project)
+        .where(Project.visibility == ProjectVisibility.PUBLIC)
+        .order_by(
+            Project.stars_count.desc(),
+            Project.views_count.desc(),
+            Project.created_at.desc(),
+            Project.id.desc()
+        )
     )
 
-    return projects
+    if cursor:
+        # Seek past the last project of the previous page
+        key = decode_cursor(cursor, int, int, datetime, int)
+        query = query.where(
+            tuple_(Project.stars_count, Project.views_count, Project.created_at, Project.id) < key
+        )
+    else:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether there is a next page
+    projects = (await db.execute(query.limit(limit + 1))).scalars().all()
+    headers = {}
+    if len(projects) > limit:
+        projects = projects[:limit]
+        last = projects[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            last.stars_count, last.views_count, last.created_at, last.id
+        )
+
+    items = _project_list_adapter.validate_python(projects, from_attributes=True)
+
+    content = _project_list_adapter.dump_json(items)
+    next_cursor = headers.get(NEXT_CURSOR_HEADER, "").encode("ascii")
+    await cache_set(cache_key, next_cursor + b"\n" + content, settings.PUBLIC_PROJECTS_CACHE_TTL_SECONDS)
+
+    return Response(content=content, media_type="application/json", headers=headers)
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
-    project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    project: Project = Depends(require_project())
 ):
     """
     Get project details
     
     - Returns full project information
     - User must be owner or project must be public
+    - Returns 304 Not Modified when If-None-Match holds the current ETag
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-    
-    # Check access permissions
-    if project.owner_id != current_user.id and project.visibility != ProjectVisibility.PUBLIC:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
+    etag = row_etag(project, project.stars_count, project.views_count)
+    not_modified = check_etag(request, response, etag)
+    if not_modified is not None:
+        return not_modified
     
     return project
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(
-    project_id: int,
     project_data: ProjectUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    project: Project = Depends(require_project("update")),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update project details
@@ -161,20 +280,7 @@ async def update_project(
     - Updates project metadata
     - Only project owner can update
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-    
-    # Check if user is owner
-    if project.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only project owner can update"
-        )
+    was_public = project.visibility == ProjectVisibility.PUBLIC
     
     # Update fields
     if project_data.name is not None:
@@ -191,17 +297,19 @@ async def update_project(
     if project_data.git_branch is not None:
         project.git_branch = project_data.git_branch
     
-    db.commit()
-    db.refresh(project)
+    # updated_at comes back in the UPDATE's RETURNING clause (eager_defaults)
+    await db.commit()
+    await cache_delete(project_access_cache_key(project.id))
+    if was_public or project.visibility == ProjectVisibility.PUBLIC:
+        await cache_incr(PUBLIC_PROJECTS_VERSION_KEY)
     
     return project
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(
-    project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    project: Project = Depends(require_project("delete")),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete project
@@ -209,22 +317,12 @@ async def delete_project(
     - Permanently deletes project and all associated data
     - Only project owner can delete
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-    
-    # Check if user is owner
-    if project.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only project owner can delete"
-        )
-    
-    db.delete(project)
-    db.commit()
+    project_id = project.id
+    was_public = project.visibility == ProjectVisibility.PUBLIC
+    await db.delete(project)
+    await db.commit()
+    await cache_delete(project_access_cache_key(project_id))
+    if was_public:
+        await cache_incr(PUBLIC_PROJECTS_VERSION_KEY)
     
     return None
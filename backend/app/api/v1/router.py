@@ -7,45 +7,18 @@ from app.api.v1 import auth, projects, files, jobs, builds, forum, modules
 
 api_router = APIRouter()
 
-# Include all routers with their prefixes and tags
-api_router.include_router(
-    auth.router,
-    prefix="/auth",
-    tags=["authentication"]
-)
-
-api_router.include_router(
-    projects.router,
-    prefix="/projects",
-    tags=["projects"]
-)
-
-api_router.include_router(
-    files.router,
-    prefix="/projects",
-    tags=["files"]
-)
-
-api_router.include_router(
-    modules.router,
-    prefix="/projects",
-    tags=["modules"]
-)
-
-api_router.include_router(
-    jobs.router,
-    prefix="/projects",
-    tags=["jobs"]
-)
-
-api_router.include_router(
-    builds.router,
-    prefix="/builds",
-    tags=["builds"]
-)
-
-api_router.include_router(
-    forum.router,
-    prefix="/forum",
-    tags=["forum"]
-)
+# Include all routers with their prefixes and tags.
+# Starlette tries routes in the order they are added, so the most requested
+# routers come first: build status and job polling, then the editor's file
+# and module calls. No path here can match routes in two routers, so the
+# order only affects matching cost.
+for router, prefix, tag in (
+    (builds.router, "/builds", "builds"),
+    (jobs.router, "/projects", "jobs"),
+    (files.router, "/projects", "files"),
+    (modules.router, "/projects", "modules"),
+    (projects.router, "/projects", "projects"),
+    (forum.router, "/forum", "forum"),
+    (auth.router, "/auth", "authentication"),
+):
+    api_router.include_router(router, prefix=prefix, tags=[tag])
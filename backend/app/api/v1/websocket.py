@@ -1,13 +1,12 @@
 """
 WebSocket API endpoints for real-time build updates
 """
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, WebSocket, Query
 import logging
-import asyncio
+import orjson
 
 from app.core.security import get_current_user_ws
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal
 from app.models.job import Job
 from app.models.user import User
 from app.websockets.manager import manager
@@ -21,8 +20,7 @@ router = APIRouter()
 async def job_updates_websocket(
     websocket: WebSocket,
     job_id: int,
-    token: str = Query(...),
-    db: Session = Depends(get_db)
+    token: str = Query(...)
 ):
     """
     WebSocket endpoint for real-time job updates
@@ -49,16 +47,20 @@ async def job_updates_websocket(
             "timestamp": "2025-01-06T12:00:00Z"
         }
     """
-    # Authenticate user via token
-    try:
-        user = await get_current_user_ws(token, db)
-    except Exception as e:
-        logger.error(f"WebSocket authentication failed: {e}")
-        await websocket.close(code=4001, reason="Authentication failed")
-        return
+    # Use a short-lived session so the connection isn't held for the
+    # lifetime of the WebSocket
+    async with AsyncSessionLocal() as db:
+        # Authenticate user via token
+        try:
+            user = await get_current_user_ws(token, db)
+        except Exception as e:
+            logger.error(f"WebSocket authentication failed: {e}")
+            await websocket.close(code=4001, reason="Authentication failed")
+            return
+
+        # Check if job exists and user has access
+        job = await db.get(Job, job_id)
 
-    # Check if job exists and user has access
-    job = db.query(Job).filter(Job.id == job_id).first()
     if not job:
         await websocket.close(code=4004, reason="Job not found")
         return
@@ -69,17 +71,12 @@ async def job_updates_websocket(
         await websocket.close(code=4003, reason="Access denied")
         return
 
-    # Accept connection
+    # Accept connection; the manager shares one Redis subscription per job
     await manager.connect(websocket, job_id)
 
     try:
-        # Start Redis subscription task
-        subscription_task = asyncio.create_task(
-            manager.subscribe_to_job_updates(job_id)
-        )
-
-        # Send initial job state
-        await websocket.send_json({
+        # Send initial job state (as a text frame; clients JSON.parse it)
+        await websocket.send_text(orjson.dumps({
             "type": "connected",
             "data": {
                 "job_id": job_id,
@@ -87,29 +84,18 @@ async def job_updates_websocket(
                 "current_step": job.current_step,
                 "progress": job.progress_data.get("progress", 0) if job.progress_data else 0
             }
-        })
+        }).decode())
 
-        # Keep connection alive and handle incoming messages
+        # Wait for the client to go away. Keep-alives are WebSocket ping
+        # frames answered below the ASGI layer (uvicorn --ws-ping-interval),
+        # so anything the client sends is ignored
         while True:
-            try:
-                # Receive messages from client (mainly for keep-alive)
-                data = await websocket.receive_text()
-
-                # Handle ping/pong for keep-alive
-                if data == "ping":
-                    await websocket.send_json({"type": "pong"})
-
-            except WebSocketDisconnect:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
                 logger.info(f"WebSocket disconnected for job {job_id}")
                 break
-            except Exception as e:
-                logger.error(f"Error in WebSocket receive loop: {e}")
-                break
 
     except Exception as e:
         logger.error(f"WebSocket error for job {job_id}: {e}")
     finally:
         manager.disconnect(websocket, job_id)
-        # Cancel subscription task if still running
-        if 'subscription_task' in locals() and not subscription_task.done():
-            subscription_task.cancel()
@@ -0,0 +1,164 @@
+"""
+Redis-backed cache helpers
+
+Cache failures are never fatal: reads fall back to a miss and writes are
+dropped, so callers always have the database as the source of truth.
+"""
+from typing import Optional
+import logging
+
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis: Optional[aioredis.Redis] = None
+
+
+# Hash of topic id -> views not yet written to the database (shared with workers)
+TOPIC_VIEWS_KEY = "forum:topic_views"
+
+# Batch taken from TOPIC_VIEWS_KEY by the running flush; only deleted once its
+# views are committed to the database (shared with workers)
+TOPIC_VIEWS_FLUSHING_KEY = "forum:topic_views:flushing"
+
+# Bumped by each flush once its views are committed; part of the topic
+# details cache key, so details read before a flush are never served after it
+TOPIC_VIEWS_VERSION_KEY = "forum:topic_views:ver"
+
+
+# Bumped whenever forum category counts change; part of the listing cache key
+FORUM_CATEGORIES_VERSION_KEY = "forum:categories:ver"
+
+
+def forum_categories_cache_key(version: int) -> str:
+    """Cache key for a version of the forum category listing"""
+    return f"forum:categories:v{version}"
+
+
+# Bumped whenever a public project is added, changed or removed; part of the
+# public project listing cache key
+PUBLIC_PROJECTS_VERSION_KEY = "projects:public:ver"
+
+
+def public_projects_cache_key(version: int, skip: int, limit: int, cursor: Optional[str]) -> str:
+    """Cache key for a page of a version of the public project listing"""
+    return f"projects:public:v{version}:{skip}:{limit}:{cursor or ''}"
+
+
+def forum_topic_cache_key(topic_id: int, version: int) -> str:
+    """Cache key for a forum topic's details as of a topic views version"""
+    return f"forum:topic:{topic_id}:v{version}"
+
+
+def user_cache_key(user_id: int) -> str:
+    """Cache key for an authenticated user's account fields"""
+    return f"user:{user_id}"
+
+
+def project_access_cache_key(project_id: int) -> str:
+    """Cache key for a project's owner and visibility"""
+    return f"project_access:{project_id}"
+
+
+def build_status_cache_key(project_id: int) -> str:
+    """Cache key for a project's latest build status (shared with workers)"""
+    return f"build_status:{project_id}"
+
+
+def get_cache() -> aioredis.Redis:
+    """Get or create the shared Redis client used for caching"""
+    global _redis
+    if _redis is None:
+        _redis = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=1,
+            socket_timeout=1
+        )
+    return _redis
+
+
+async def cache_get(key: str) -> Optional[bytes]:
+    """
+    Get a cached value
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Cached bytes, or None on a miss or if Redis is unavailable
+    """
+    try:
+        return await get_cache().get(key)
+    except Exception as e:
+        logger.warning(f"Cache get failed for {key}: {e}")
+        return None
+
+
+async def cache_set(key: str, value: bytes, ttl: int):
+    """
+    Store a value in the cache
+
+    Args:
+        key: Cache key
+        value: Value to store
+        ttl: Time to live in seconds
+    """
+    try:
+        await get_cache().set(key, value, ex=ttl)
+    except Exception as e:
+        logger.warning(f"Cache set failed for {key}: {e}")
+
+
+async def cache_incr(key: str) -> Optional[int]:
+    """
+    Increment a counter
+
+    Args:
+        key: Counter key
+
+    Returns:
+        New counter value, or None if Redis is unavailable
+    """
+    try:
+        return await get_cache().incr(key)
+    except Exception as e:
+        logger.warning(f"Cache incr failed for {key}: {e}")
+        return None
+
+
+async def cache_delete(key: str):
+    """
+    Remove a value from the cache
+
+    Args:
+        key: Cache key
+    """
+    try:
+        await get_cache().delete(key)
+    except Exception as e:
+        logger.warning(f"Cache delete failed for {key}: {e}")
+
+
+async def buffer_topic_view(topic_id: int) -> Optional[int]:
+    """
+    Buffer a forum topic view for the periodic flush
+
+    Args:
+        topic_id: Topic ID
+
+    Returns:
+        The topic's views not yet in the database, counting the batch a
+        running flush is writing, or None if Redis is unavailable
+    """
+    try:
+        # One MULTI, so a flush taking the batch can't be seen half-way
+        pipe = get_cache().pipeline(transaction=True)
+        pipe.hincrby(TOPIC_VIEWS_KEY, str(topic_id), 1)
+        pipe.hget(TOPIC_VIEWS_FLUSHING_KEY, str(topic_id))
+        pending, flushing = await pipe.execute()
+        return pending + int(flushing or 0)
+    except Exception as e:
+        logger.warning(f"Buffering view failed for topic {topic_id}: {e}")
+        return None
@@ -3,21 +3,94 @@ Core configuration settings for a6hub backend
 Uses Pydantic settings management with environment variables
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import cached_property, lru_cache
+from pathlib import Path
 from typing import List, Optional
+import logging
+import os
 import secrets
 
+logger = logging.getLogger(__name__)
+
+def _load_or_create_secret_key(path: Path) -> str:
+    """
+    Get the generated secret key shared by every API process on this host
+
+    The first process to get here writes a new key to the key file; the
+    others read it back, so tokens signed by one API worker verify in all of
+    them and across restarts. The file must live on a volume only the API
+    mounts: job workers run user code and must never be able to read it.
+
+    Args:
+        path: Key file location (SECRET_KEY_FILE)
+
+    Returns:
+        Secret key
+    """
+    try:
+        return path.read_text().strip()
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not read {path}: {e}")
+
+    key = secrets.token_urlsafe(32)
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Write a private temp file, then link it into place: the link fails
+        # if another process won the race, and readers never see a partial key
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(key)
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            key = path.read_text().strip()
+        finally:
+            tmp_path.unlink()
+    except OSError as e:
+        logger.warning(f"Could not persist SECRET_KEY to {path}, using a per-process key: {e}")
+    return key
+
 
 class Settings(BaseSettings):
-    """Application settings loaded from environment variables"""
+    """
+    Application settings loaded from environment variables
+
+    Derived URLs are cached properties: settings are frozen, so each is
+    built once on first access.
+    """
     
     # Application
     PROJECT_NAME: str = "a6hub"
     API_V1_STR: str = "/api/v1"
-    SECRET_KEY: str = secrets.token_urlsafe(32)
+    # Set in production. If unset, a key is generated once and kept in
+    # SECRET_KEY_FILE, which must be on a volume only the API mounts
+    SECRET_KEY: str = ""
+    SECRET_KEY_FILE: str = "/a6hub-secrets/secret_key"
     
     # Security
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     ALGORITHM: str = "HS256"
+
+    @cached_property
+    def JWT_SECRET_KEY(self) -> str:
+        """
+        Key used to sign and verify access tokens
+
+        SECRET_KEY when configured, otherwise a generated key read from (or
+        created at) SECRET_KEY_FILE. Only resolved when a token is signed or
+        verified, so job workers never touch the key file.
+        """
+        if self.SECRET_KEY:
+            return self.SECRET_KEY
+        path = Path(self.SECRET_KEY_FILE)
+        logger.warning(
+            f"SECRET_KEY is not set; using a generated key from {path}. "
+            "Set SECRET_KEY in production."
+        )
+        return _load_or_create_secret_key(path)
     
     # CORS
     CORS_ORIGINS: List[str] = [
@@ -32,14 +105,39 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = "localhost"
     POSTGRES_PORT: str = "5432"
     
-    @property
+    @cached_property
     def DATABASE_URL(self) -> str:
         return (
             f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
-    @property
+    @cached_property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """DATABASE_URL using the asyncpg driver for AsyncSession"""
+        return self.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    # Async (request handler) pool, as a total across the WEB_CONCURRENCY
+    # uvicorn workers: each process gets its share. Set DB_NULL_POOL when
+    # something else (e.g. PgBouncer) does the pooling
+    WEB_CONCURRENCY: int = 1
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+
+    # Sync pool per process. Only module reparse/parse endpoints and the
+    # Celery workers use it, so it stays small
+    DB_SYNC_POOL_SIZE: int = 2
+    DB_SYNC_MAX_OVERFLOW: int = 3
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_NULL_POOL: bool = False
+
+    # Connecting through PgBouncer in transaction mode: implies DB_NULL_POOL
+    # and turns off asyncpg's prepared statements, which don't survive the
+    # server connection changing between transactions
+    DB_PGBOUNCER: bool = False
+
+    @cached_property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
         """Alias for DATABASE_URL for SQLAlchemy compatibility"""
         return self.DATABASE_URL
@@ -49,19 +147,44 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     
-    @property
+    @cached_property
     def REDIS_URL(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
+
+    # Authenticated user lookups are cached briefly to absorb polling bursts
+    USER_CACHE_TTL_SECONDS: int = 30
+
+    # Verified access token payloads are reused in-process for this window
+    TOKEN_DECODE_CACHE_SECONDS: int = 30
+
+    # Project owner/visibility used for read access checks on polled endpoints
+    PROJECT_ACCESS_CACHE_TTL_SECONDS: int = 60
+
+    # Build status responses are cached briefly to collapse client polling
+    BUILD_STATUS_CACHE_TTL_SECONDS: int = 2
+
+    # Forum category listings are cached until a topic or post changes the counts
+    FORUM_CATEGORIES_CACHE_TTL_SECONDS: int = 300
+
+    # Forum topic details are cached until the topic changes or its views are flushed
+    FORUM_TOPIC_CACHE_TTL_SECONDS: int = 60
+
+    # Public project listings are cached until a public project changes;
+    # star and view counts may lag by up to this long
+    PUBLIC_PROJECTS_CACHE_TTL_SECONDS: int = 60
+
+    # Forum topic views are buffered in Redis and written to the database in batches
+    TOPIC_VIEWS_FLUSH_INTERVAL_SECONDS: int = 30
     
     # Celery
     CELERY_BROKER_URL: Optional[str] = None
     CELERY_RESULT_BACKEND: Optional[str] = None
     
-    @property
+    @cached_property
     def celery_broker_url(self) -> str:
         return self.CELERY_BROKER_URL or self.REDIS_URL
     
-    @property
+    @cached_property
     def celery_result_backend(self) -> str:
         return self.CELERY_RESULT_BACKEND or self.REDIS_URL
     
@@ -72,6 +195,14 @@ class Settings(BaseSettings):
     MINIO_BUCKET_NAME: str = "a6hub-artifacts"  # For job artifacts
     MINIO_FILES_BUCKET: str = "a6hub-files"  # For project files
     MINIO_SECURE: bool = False
+    # Keep-alive connections to MinIO; match the request threadpool size so
+    # concurrent uploads/downloads reuse sockets instead of discarding them
+    MINIO_MAX_POOL_CONNECTIONS: int = 40
+
+    # Redirect raw file downloads to presigned MinIO URLs instead of proxying
+    # the bytes; only enable when clients can reach MINIO_ENDPOINT directly
+    FILE_DOWNLOAD_REDIRECT: bool = False
+    FILE_DOWNLOAD_URL_EXPIRE_SECONDS: int = 300
 
     # Yosys configuration for Verilog parsing
     YOSYS_PATH: str = "/usr/bin/yosys"
@@ -79,6 +210,12 @@ class Settings(BaseSettings):
     # Storage paths
     STORAGE_BASE_PATH: str = "/a6hub-storage"
     GIT_REPOS_PATH: str = "/a6hub-repos"
+
+    # Worker cache of downloaded project files, keyed by content hash. Kept
+    # outside STORAGE_BASE_PATH, where job directories live, and trimmed to
+    # FILE_CACHE_MAX_MB by evicting the least recently used files
+    FILE_CACHE_PATH: str = "/var/cache/a6hub/file-cache"
+    FILE_CACHE_MAX_MB: int = 1024
     
     # EDA Tools paths (in worker containers)
     LIBRELANE_PATH: str = "/opt/librelane"
@@ -102,9 +239,21 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
-        extra="ignore"
+        extra="ignore",
+        # Settings are read once per process and never changed afterwards
+        frozen=True
     )
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the process-wide settings
+
+    The environment and .env file are parsed on the first call only.
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
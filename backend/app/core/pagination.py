@@ -0,0 +1,69 @@
+"""
+Keyset (cursor) pagination helpers
+
+A cursor is the sort key of the last row on a page, encoded as an opaque
+URL-safe string. The next page is everything strictly after that key,
+which the database can seek to through an index instead of scanning and
+discarding OFFSET rows.
+"""
+from datetime import datetime
+from typing import Any, Tuple
+import base64
+
+import orjson
+from fastapi import HTTPException, status
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode a row's sort key as a cursor
+
+    Args:
+        values: Sort key values (datetimes, ints, bools, strings)
+
+    Returns:
+        URL-safe cursor string
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode("ascii")
+
+
+def _restore_value(value: Any, expected: type) -> Any:
+    """Check one decoded cursor value against its expected type"""
+    if value is None:
+        return None
+    if expected is datetime:
+        return datetime.fromisoformat(value)
+    # bool is an int subclass, so it is never accepted for an int slot
+    if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+        raise TypeError(f"expected {expected.__name__} in cursor")
+    return value
+
+
+def decode_cursor(cursor: str, *types: type) -> Tuple[Any, ...]:
+    """
+    Decode a cursor back into its sort key
+
+    Args:
+        cursor: Cursor string from a previous page
+        types: Expected type of each value, used to check values and
+            restore datetimes
+
+    Returns:
+        Tuple of sort key values
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if len(values) != len(types):
+            raise ValueError("cursor length mismatch")
+        return tuple(_restore_value(value, expected) for value, expected in zip(values, types))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
@@ -1,16 +1,22 @@
 """
 Security utilities for JWT token handling and password hashing
 """
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+import orjson
+import time
 
+from app.core.cache import cache_delete, cache_get, cache_set, user_cache_key
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.models.user import User
 
 # Password hashing context
@@ -20,6 +26,38 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """
+    Account fields of the authenticated user (never the password hash)
+
+    Returned by the auth dependencies instead of a User row, so cached
+    lookups can't be mistaken for session-bound objects.
+    """
+    id: int
+    email: str
+    username: str
+    full_name: Optional[str]
+    is_active: bool
+    is_superuser: bool
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthenticatedUser":
+        """Copy the account fields of a User row"""
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -49,32 +87,101 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM)
     
     return encoded_jwt
 
 
+@lru_cache(maxsize=1024)
+def _decode_access_token_cached(token: str, window: int) -> Optional[dict]:
+    """Verify a token once per cache window (the window is only part of the key)"""
+    try:
+        return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+
+
 def decode_access_token(token: str) -> Optional[dict]:
     """
     Decode and verify JWT token
-    
+
+    Verified payloads are reused for a short window so bursts of requests
+    with the same token don't each pay for signature verification.
+
     Args:
         token: JWT token string
-    
+
     Returns:
         Decoded token payload or None if invalid
     """
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
-    except JWTError:
+    now = time.time()
+    payload = _decode_access_token_cached(token, int(now // settings.TOKEN_DECODE_CACHE_SECONDS))
+    if payload is None:
+        return None
+
+    # A cached payload may have expired since it was verified
+    expires_at = payload.get("exp")
+    if expires_at is not None and expires_at <= now:
         return None
 
+    return dict(payload)
+
+
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[AuthenticatedUser]:
+    """
+    Load a user's account fields by ID, consulting the Redis cache first
+
+    Entries live for USER_CACHE_TTL_SECONDS; anything that changes a user
+    must call invalidate_user_cache so the change applies immediately.
+
+    Args:
+        db: Database session
+        user_id: User ID
+
+    Returns:
+        AuthenticatedUser or None if not found
+    """
+    cache_key = user_cache_key(user_id)
+
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        data = orjson.loads(cached)
+        for field in ("created_at", "updated_at"):
+            if data[field] is not None:
+                data[field] = datetime.fromisoformat(data[field])
+        return AuthenticatedUser(**data)
+
+    user = await db.get(User, user_id)
+    if user is None:
+        return None
+
+    authenticated_user = AuthenticatedUser.from_user(user)
+    await cache_set(
+        cache_key,
+        orjson.dumps(asdict(authenticated_user)),
+        settings.USER_CACHE_TTL_SECONDS
+    )
+
+    return authenticated_user
+
+
+async def invalidate_user_cache(user_id: int):
+    """
+    Drop a user's cached account fields
+
+    Call after committing any change to the user (deactivation, password,
+    superuser flag, profile) or deleting it.
+
+    Args:
+        user_id: User ID
+    """
+    await cache_delete(user_cache_key(user_id))
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> AuthenticatedUser:
     """
     Dependency to get current authenticated user from JWT token
     
@@ -104,7 +211,7 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = await get_user_by_id(db, int(user_id))
     
     if user is None:
         raise credentials_exception
@@ -118,9 +225,58 @@ async def get_current_user(
     return user
 
 
+def get_current_user_sync(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> AuthenticatedUser:
+    """
+    Dependency to get current authenticated user for sync (plain def) endpoints
+
+    Loads the user through the request's sync session, so an endpoint that
+    also depends on get_db opens a single session on a single pool.
+
+    Args:
+        credentials: HTTP Bearer token credentials
+        db: Database session
+
+    Returns:
+        Current user object
+
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    payload = decode_access_token(credentials.credentials)
+
+    if payload is None:
+        raise credentials_exception
+
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise credentials_exception
+
+    user = db.get(User, int(user_id))
+
+    if user is None:
+        raise credentials_exception
+
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
+        )
+
+    return AuthenticatedUser.from_user(user)
+
+
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> AuthenticatedUser:
     """
     Dependency to ensure user is active
 
@@ -140,8 +296,8 @@ async def get_current_active_user(
 
 async def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[AuthenticatedUser]:
     """
     Dependency to get current user if authenticated, None otherwise
 
@@ -166,7 +322,7 @@ async def get_optional_user(
         if user_id is None:
             return None
 
-        user = db.query(User).filter(User.id == int(user_id)).first()
+        user = await get_user_by_id(db, int(user_id))
 
         if user is None or not user.is_active:
             return None
@@ -176,7 +332,7 @@ async def get_optional_user(
         return None
 
 
-async def get_current_user_ws(token: str, db: Session) -> User:
+async def get_current_user_ws(token: str, db: AsyncSession) -> User:
     """
     Get current user from WebSocket token (query parameter)
 
@@ -204,7 +360,7 @@ async def get_current_user_ws(token: str, db: Session) -> User:
     if user_id is None:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = await db.get(User, int(user_id))
 
     if user is None:
         raise credentials_exception
@@ -3,27 +3,101 @@ Database session management
 """
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from typing import Any, Generator, AsyncGenerator
+from uuid import uuid4
+import orjson
 
 from app.core.config import settings
 
+
+def _pool_options(pool_size: int, max_overflow: int) -> dict:
+    """
+    Connection pool arguments shared by the sync and async engines
+
+    Args:
+        pool_size: Connections kept open by this process
+        max_overflow: Extra connections this process may open under load
+
+    Returns:
+        dict: Keyword arguments for create_engine/create_async_engine
+    """
+    if settings.DB_NULL_POOL or settings.DB_PGBOUNCER:
+        return {"poolclass": NullPool}
+    return {
+        "pool_pre_ping": True,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        # Hand out the most recently returned connection first, so light
+        # load is served by a few hot connections. This does not close the
+        # idle ones: pool_recycle is only checked on checkout
+        "pool_use_lifo": True,
+    }
+
+
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON columns with orjson (non-string keys become strings, as with json)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# JSON column (de)serializers shared by the sync and async engines
+_JSON_OPTIONS = {"json_serializer": _json_serializer, "json_deserializer": orjson.loads}
+
+
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
     echo=False,
-    pool_size=5,
-    max_overflow=10
+    **_JSON_OPTIONS,
+    **_pool_options(settings.DB_SYNC_POOL_SIZE, settings.DB_SYNC_MAX_OVERFLOW)
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def _asyncpg_connect_args() -> dict:
+    """asyncpg connection arguments; PgBouncer needs prepared statements off"""
+    if not settings.DB_PGBOUNCER:
+        return {}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        # Names must be unique across the PgBouncer's server connections
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+
+# Create async engine (asyncpg) for request handlers; DB_POOL_SIZE and
+# DB_MAX_OVERFLOW are split across the uvicorn worker processes
+_web_processes = max(settings.WEB_CONCURRENCY, 1)
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    echo=False,
+    connect_args=_asyncpg_connect_args(),
+    **_JSON_OPTIONS,
+    **_pool_options(
+        max(settings.DB_POOL_SIZE // _web_processes, 1),
+        settings.DB_MAX_OVERFLOW // _web_processes,
+    )
+)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency to get database session
-    
+
     Yields:
         Database session
     """
@@ -32,3 +106,14 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get async database session
+
+    Yields:
+        Async database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
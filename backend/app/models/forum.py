@@ -1,9 +1,9 @@
 """
 Forum database models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import false, func, text
 
 from app.db.base import Base
 
@@ -23,6 +23,10 @@ class ForumCategory(Base):
     order = Column(Integer, default=0)  # For custom ordering
     icon = Column(String(50), nullable=True)  # Icon name from lucide-react
 
+    # Denormalized counters, maintained by the forum endpoints
+    topic_count = Column(Integer, default=0, nullable=False)
+    post_count = Column(Integer, default=0, nullable=False)
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -41,6 +45,15 @@ class ForumTopic(Base):
     """
 
     __tablename__ = "forum_topics"
+    __table_args__ = (
+        # Keyset pagination of topics within a category
+        Index(
+            "ix_forum_topics_category_listing",
+            "category_id", text("is_pinned DESC"), text("last_post_at DESC"), text("id DESC")
+        ),
+        # Slugs are unique within a category
+        Index("uq_forum_topics_category_slug", "category_id", "slug", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
@@ -55,14 +68,16 @@ class ForumTopic(Base):
     author = relationship("User")
 
     # Topic metadata
-    is_pinned = Column(Boolean, default=False)
+    is_pinned = Column(Boolean, default=False, server_default=false(), nullable=False)  # Listing sort key
     is_locked = Column(Boolean, default=False)
     views_count = Column(Integer, default=0)
+    post_count = Column(Integer, default=0, nullable=False)  # Denormalized, maintained by the forum endpoints
+    first_post_id = Column(Integer, nullable=True)  # Opening post; no FK so topic and posts can be deleted in any order
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    last_post_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_post_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Listing sort key
 
     # Relationships
     posts = relationship("ForumPost", back_populates="topic", cascade="all, delete-orphan")
@@ -78,6 +93,10 @@ class ForumPost(Base):
     """
 
     __tablename__ = "forum_posts"
+    __table_args__ = (
+        # Keyset pagination of posts within a topic
+        Index("ix_forum_posts_topic_created", "topic_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
@@ -95,7 +114,7 @@ class ForumPost(Base):
     edited_at = Column(DateTime(timezone=True), nullable=True)
 
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Listing sort key
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     def __repr__(self):
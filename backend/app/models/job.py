@@ -1,9 +1,9 @@
 """
 Job database model for build and simulation tasks
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, JSON, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import enum
 
 from app.db.base import Base
@@ -33,6 +33,12 @@ class Job(Base):
     """
     
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Latest job of a given type for a project (build config/status lookups)
+        Index("ix_jobs_project_type_created", "project_id", "job_type", text("created_at DESC")),
+        # All jobs of a project, newest first (job listing)
+        Index("ix_jobs_project_created", "project_id", text("created_at DESC")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -5,7 +5,7 @@ Modules represent reusable design components:
 - Verilog modules (digital design)
 - Python classes/functions (analog layout, parameterized designs)
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, JSON
+from sqlalchemy import DDL, Column, Integer, String, DateTime, ForeignKey, Text, Enum, JSON, Index, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -31,6 +31,21 @@ class Module(Base):
     """
 
     __tablename__ = "modules"
+    __table_args__ = (
+        # Trigram index so substring name search (ILIKE '%...%') avoids a full scan
+        Index(
+            "ix_modules_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"}
+        ),
+        # A project's modules, optionally of one type, by name (module listing)
+        Index("ix_modules_project_type_name", "project_id", "module_type", "name"),
+    )
+
+    # Fetch server-generated columns (updated_at) in the UPDATE's RETURNING
+    # clause so an updated module can be returned without a refresh query
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -63,3 +78,11 @@ class Module(Base):
 
     def __repr__(self):
         return f"<Module(name={self.name}, type={self.module_type}, file_id={self.file_id})>"
+
+
+# The trigram index needs pg_trgm; create it along with the table
+event.listen(
+    Module.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
@@ -1,7 +1,7 @@
 """
 Project database model
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Enum, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -22,6 +22,22 @@ class Project(Base):
     """
     
     __tablename__ = "projects"
+    __table_args__ = (
+        # A user's projects, newest first (project listing)
+        Index("ix_projects_owner_created", "owner_id", text("created_at DESC")),
+        # Public projects by popularity (public project listing)
+        Index(
+            "ix_projects_public_rank",
+            "visibility",
+            text("stars_count DESC"),
+            text("views_count DESC"),
+            text("created_at DESC")
+        ),
+    )
+
+    # Fetch server-generated columns (created_at) in the INSERT's RETURNING
+    # clause so a new project can be returned without a refresh query
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
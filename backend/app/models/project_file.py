@@ -1,8 +1,8 @@
 """
 ProjectFile database model
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Index
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from app.db.base import Base
@@ -17,6 +17,10 @@ class ProjectFile(Base):
     """
 
     __tablename__ = "project_files"
+    __table_args__ = (
+        # Per-project file listing and duplicate filepath checks
+        Index("ix_project_files_project_filepath", "project_id", "filepath"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, nullable=False)
@@ -27,8 +31,9 @@ class ProjectFile(Base):
     minio_key = Column(String, nullable=True)  # Object key in MinIO
 
     # Legacy support - content field kept for backward compatibility
-    # New files should use MinIO storage
-    content = Column(Text, nullable=True)  # Deprecated - use MinIO
+    # New files should use MinIO storage. Deferred so file listings and
+    # lookups don't load it; readers undefer it explicitly.
+    content = deferred(Column(Text, nullable=True))  # Deprecated - use MinIO
     use_minio = Column(Boolean, default=True)  # Whether file uses MinIO storage
 
     # File metadata
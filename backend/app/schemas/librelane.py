@@ -4,6 +4,7 @@ Pydantic schemas for LibreLane flow configuration
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 from enum import Enum
+from functools import lru_cache
 
 
 class PDKType(str, Enum):
@@ -123,6 +124,11 @@ class LibreLaneBuildRequest(BaseModel):
     config: LibreLaneFlowConfig
 
 
+class LibreLaneBatchBuildRequest(BaseModel):
+    """Request schema for starting several LibreLane builds at once"""
+    builds: List[LibreLaneBuildRequest] = Field(..., min_length=1, max_length=20)
+
+
 class LibreLaneBuildStatus(BaseModel):
     """Status response for LibreLane build"""
     job_id: int
@@ -140,52 +146,61 @@ class LibreLaneFlowPreset(BaseModel):
     config: LibreLaneFlowConfig
 
 
-# Common presets
-LIBRELANE_PRESETS = {
-    "minimal": LibreLaneFlowPreset(
-        name="Minimal Flow",
-        description="Fast flow for quick iterations and testing",
-        config=LibreLaneFlowConfig(
-            design_name="example",
-            verilog_files=[],  # Auto-detect from project files
-            pdk=PDKType.SKY130_HD,
-            clock_period="20",
-            pl_target_density="0.3",
-            run_drc=False,
-            run_lvs=False,
-        )
-    ),
-    "balanced": LibreLaneFlowPreset(
-        name="Balanced Flow",
-        description="Balanced between speed and quality",
-        config=LibreLaneFlowConfig(
-            design_name="example",
-            verilog_files=[],  # Auto-detect from project files
-            pdk=PDKType.SKY130_HD,
-            clock_period="10",
-            pl_target_density="0.5",
-            fp_core_util=50,
-            run_drc=True,
-            run_lvs=True,
-        )
-    ),
-    "high_quality": LibreLaneFlowPreset(
-        name="High Quality Flow",
-        description="Maximum quality for tape-out ready designs",
-        config=LibreLaneFlowConfig(
-            design_name="example",
-            verilog_files=[],  # Auto-detect from project files
-            pdk=PDKType.SKY130_HD,
-            clock_period="5",
-            pl_target_density="0.7",
-            fp_core_util=70,
-            drt_opt_iters=128,
-            run_drc=True,
-            run_lvs=True,
-            run_magic_drc=True,
-            run_klayout_drc=True,
-            sta_pre_cts=True,
-            sta_post_cts=True,
-        )
-    ),
+# Common presets, kept as plain data and only validated into models on first use
+_PRESET_DEFINITIONS: Dict[str, Dict[str, Any]] = {
+    "minimal": {
+        "name": "Minimal Flow",
+        "description": "Fast flow for quick iterations and testing",
+        "config": {
+            "design_name": "example",
+            "verilog_files": [],  # Auto-detect from project files
+            "pdk": PDKType.SKY130_HD,
+            "clock_period": "20",
+            "pl_target_density": "0.3",
+            "run_drc": False,
+            "run_lvs": False,
+        },
+    },
+    "balanced": {
+        "name": "Balanced Flow",
+        "description": "Balanced between speed and quality",
+        "config": {
+            "design_name": "example",
+            "verilog_files": [],  # Auto-detect from project files
+            "pdk": PDKType.SKY130_HD,
+            "clock_period": "10",
+            "pl_target_density": "0.5",
+            "fp_core_util": 50,
+            "run_drc": True,
+            "run_lvs": True,
+        },
+    },
+    "high_quality": {
+        "name": "High Quality Flow",
+        "description": "Maximum quality for tape-out ready designs",
+        "config": {
+            "design_name": "example",
+            "verilog_files": [],  # Auto-detect from project files
+            "pdk": PDKType.SKY130_HD,
+            "clock_period": "5",
+            "pl_target_density": "0.7",
+            "fp_core_util": 70,
+            "drt_opt_iters": 128,
+            "run_drc": True,
+            "run_lvs": True,
+            "run_magic_drc": True,
+            "run_klayout_drc": True,
+            "sta_pre_cts": True,
+            "sta_post_cts": True,
+        },
+    },
 }
+
+
+@lru_cache(maxsize=1)
+def get_librelane_presets() -> Dict[str, LibreLaneFlowPreset]:
+    """Get the common flow presets, validated on the first call"""
+    return {
+        key: LibreLaneFlowPreset.model_validate(definition)
+        for key, definition in _PRESET_DEFINITIONS.items()
+    }
@@ -1,11 +1,46 @@
 """
 Pydantic schemas for Project model
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
+import re
 from app.models.project import ProjectVisibility
 
+# Control characters and backslashes are never valid in file paths
+_UNSAFE_PATH_CHARS_RE = re.compile(r'[\x00-\x1f\x7f\\]')
+
+
+def validate_file_path(path: str, allow_directories: bool = True) -> str:
+    """
+    Validate a project-relative file path
+
+    Paths end up joined onto job work directories, so they must not be able
+    to escape them.
+
+    Args:
+        path: Path relative to the project root
+        allow_directories: If False, the path must be a bare filename
+
+    Returns:
+        The validated path
+
+    Raises:
+        ValueError: If the path is absolute, escapes the project or contains invalid characters
+    """
+    if not path or _UNSAFE_PATH_CHARS_RE.search(path):
+        raise ValueError("must be a non-empty path without control characters or backslashes")
+    if path.startswith("/"):
+        raise ValueError("must be a relative path")
+
+    segments = path.split("/")
+    if not allow_directories and len(segments) > 1:
+        raise ValueError("must be a filename without directories")
+    if any(segment in ("", ".", "..") for segment in segments):
+        raise ValueError("must not contain empty, '.' or '..' path segments")
+
+    return path
+
 
 # Project Creation
 class ProjectCreate(BaseModel):
@@ -67,12 +102,27 @@ class ProjectFileCreate(BaseModel):
     content: Optional[str] = None
     mime_type: str = "text/plain"
 
+    @field_validator("filename")
+    @classmethod
+    def check_filename(cls, value: str) -> str:
+        return validate_file_path(value, allow_directories=False)
+
+    @field_validator("filepath")
+    @classmethod
+    def check_filepath(cls, value: str) -> str:
+        return validate_file_path(value)
+
 
 class ProjectFileUpdate(BaseModel):
     """Schema for updating a file"""
     content: Optional[str] = None
     filename: Optional[str] = None
 
+    @field_validator("filename")
+    @classmethod
+    def check_filename(cls, value: Optional[str]) -> Optional[str]:
+        return None if value is None else validate_file_path(value, allow_directories=False)
+
 
 class ProjectFileResponse(BaseModel):
     """Schema for file data in responses"""
@@ -5,12 +5,13 @@ Coordinates parsing of files and extraction of design modules.
 """
 import logging
 from typing import List
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.module import Module, ModuleType
 from app.models.project_file import ProjectFile
 from app.services.verilog_parser import verilog_parser
 from app.services.python_parser import python_parser
+from app.services.storage import storage_service
 from app.schemas.module import ModuleParseResult, ModuleResponse
 
 logger = logging.getLogger(__name__)
@@ -114,18 +115,16 @@ class ModuleExtractor:
                     logger.error(error_msg)
                     errors.append(error_msg)
 
-            # Commit all changes
-            db.commit()
-
-            # Refresh to get relationships
-            for module in created_modules:
-                db.refresh(module)
-
-            # Convert to response schema
+            # Convert to response schema while the rows are loaded; flush
+            # already fetched server defaults (eager_defaults), so this needs
+            # no refresh query per module
             module_responses = [
                 ModuleResponse.model_validate(m) for m in created_modules
             ]
 
+            # Commit all changes
+            db.commit()
+
             return ModuleParseResult(
                 success=len(errors) == 0,
                 modules_found=len(created_modules),
@@ -162,7 +161,10 @@ class ModuleExtractor:
         """
         from app.models.project import Project
 
-        project = db.query(Project).filter(Project.id == project_id).first()
+        # Load the files and their legacy content with the project
+        project = db.query(Project).options(
+            selectinload(Project.files).undefer(ProjectFile.content)
+        ).filter(Project.id == project_id).first()
         if not project:
             return ModuleParseResult(
                 success=False,
@@ -179,23 +181,30 @@ class ModuleExtractor:
         for file in project.files:
             # Get file content
             if file.use_minio and file.minio_bucket and file.minio_key:
-                # TODO: Download from MinIO
-                all_warnings.append(f"MinIO download not yet implemented for {file.filename}")
-                continue
+                try:
+                    content = storage_service.download_file(file.minio_bucket, file.minio_key).decode('utf-8')
+                except Exception as e:
+                    all_errors.append(f"Failed to download {file.filename} from storage: {e}")
+                    continue
 
             elif file.content:
                 # Use legacy content field
-                result = self.extract_modules_from_file(
-                    file.content,
-                    file.id,
-                    project_id,
-                    file.filename,
-                    db
-                )
+                content = file.content
+
+            else:
+                continue
+
+            result = self.extract_modules_from_file(
+                content,
+                file.id,
+                project_id,
+                file.filename,
+                db
+            )
 
-                all_modules.extend(result.modules)
-                all_errors.extend(result.errors)
-                all_warnings.extend(result.warnings)
+            all_modules.extend(result.modules)
+            all_errors.extend(result.errors)
+            all_warnings.extend(result.warnings)
 
         return ModuleParseResult(
             success=len(all_errors) == 0,
@@ -5,8 +5,12 @@ Handles file upload, download, and management in MinIO object storage.
 """
 import hashlib
 import logging
+import os
+from datetime import timedelta
 from io import BytesIO
-from typing import Optional, BinaryIO
+from typing import Optional, BinaryIO, Iterator
+import certifi
+import urllib3
 from minio import Minio
 from minio.error import S3Error
 
@@ -15,6 +19,40 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 
+class ObjectStream:
+    """
+    Chunked reader over a MinIO object
+
+    Releases the underlying HTTP connection once the object is exhausted or
+    close() is called, whichever comes first.
+    """
+
+    def __init__(self, response, chunk_size: int):
+        self._response = response
+        self._chunks = response.stream(chunk_size)
+        self._closed = False
+
+        length = response.headers.get("Content-Length")
+        self.content_length: Optional[int] = int(length) if length is not None else None
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self
+
+    def __next__(self) -> bytes:
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            self.close()
+            raise
+
+    def close(self):
+        """Close the object response and return its connection to the pool"""
+        if not self._closed:
+            self._closed = True
+            self._response.close()
+            self._response.release_conn()
+
+
 class StorageService:
     """Service for managing file storage in MinIO"""
 
@@ -32,7 +70,8 @@ class StorageService:
                     settings.MINIO_ENDPOINT,
                     access_key=settings.MINIO_ACCESS_KEY,
                     secret_key=settings.MINIO_SECRET_KEY,
-                    secure=settings.MINIO_SECURE
+                    secure=settings.MINIO_SECURE,
+                    http_client=self._build_http_client()
                 )
                 self._ensure_bucket_exists()
                 logger.info(f"Connected to MinIO at {settings.MINIO_ENDPOINT}")
@@ -46,6 +85,28 @@ class StorageService:
                 raise
         return self._client
 
+    @staticmethod
+    def _build_http_client() -> urllib3.PoolManager:
+        """
+        Build the connection pool shared by all MinIO calls
+
+        Same timeouts, retries and CA handling as the minio-py default, but
+        with a pool large enough for the request threadpool; the default
+        keeps only 10 connections per host and reconnects for the rest.
+        """
+        timeout = timedelta(minutes=5).seconds
+        return urllib3.PoolManager(
+            timeout=urllib3.util.Timeout(connect=timeout, read=timeout),
+            maxsize=settings.MINIO_MAX_POOL_CONNECTIONS,
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+            retries=urllib3.Retry(
+                total=5,
+                backoff_factor=0.2,
+                status_forcelist=[500, 502, 503, 504]
+            )
+        )
+
     def _ensure_bucket_exists(self):
         """Ensure the files bucket exists"""
         try:
@@ -129,15 +190,87 @@ class StorageService:
         """
         try:
             response = self.client.get_object(bucket, object_key)
-            content = response.read()
+        except S3Error as e:
+            logger.error(f"Error downloading file from MinIO: {e}")
+            raise
+
+        try:
+            return response.read()
+        finally:
             response.close()
             response.release_conn()
-            return content
 
+    def stream_file(
+        self,
+        bucket: str,
+        object_key: str,
+        chunk_size: int = 64 * 1024,
+        offset: int = 0,
+        length: int = 0
+    ) -> ObjectStream:
+        """
+        Stream a file, or a byte range of it, from MinIO in chunks
+
+        The object is opened eagerly so missing objects raise here rather
+        than partway through a response. Callers that may stop reading early
+        must call close() on the returned stream.
+
+        Args:
+            bucket: Bucket name
+            object_key: Object key
+            chunk_size: Size of each chunk in bytes
+            offset: Byte offset to start reading from
+            length: Number of bytes to read (0 reads to the end)
+
+        Returns:
+            Iterator over the file content
+        """
+        try:
+            response = self.client.get_object(bucket, object_key, offset=offset, length=length)
         except S3Error as e:
             logger.error(f"Error downloading file from MinIO: {e}")
             raise
 
+        return ObjectStream(response, chunk_size)
+
+    def presigned_download_url(
+        self,
+        bucket: str,
+        object_key: str,
+        expires: timedelta,
+        content_disposition: Optional[str] = None,
+        content_type: Optional[str] = None
+    ) -> str:
+        """
+        Generate a time-limited URL for downloading a file directly from MinIO
+
+        Args:
+            bucket: Bucket name
+            object_key: Object key
+            expires: How long the URL stays valid
+            content_disposition: Content-Disposition for MinIO to respond with
+            content_type: Content-Type for MinIO to respond with
+
+        Returns:
+            Presigned GET URL
+        """
+        response_headers = {}
+        if content_disposition:
+            response_headers["response-content-disposition"] = content_disposition
+        if content_type:
+            response_headers["response-content-type"] = content_type
+
+        try:
+            return self.client.presigned_get_object(
+                bucket,
+                object_key,
+                expires=expires,
+                response_headers=response_headers or None
+            )
+        except S3Error as e:
+            logger.error(f"Error presigning MinIO download: {e}")
+            raise
+
     def delete_file(self, bucket: str, object_key: str):
         """
         Delete a file from MinIO
@@ -5,7 +5,7 @@ from fastapi import WebSocket
 from typing import Dict, Set
 import logging
 import asyncio
-import json
+import orjson
 from redis import asyncio as aioredis
 from app.core.config import settings
 
@@ -18,6 +18,8 @@ class ConnectionManager:
     def __init__(self):
         # Store active connections per job_id
         self.active_connections: Dict[int, Set[WebSocket]] = {}
+        # One Redis subscription per job, shared by all of its connections
+        self.subscriptions: Dict[int, asyncio.Task] = {}
         self.redis: aioredis.Redis = None
 
     async def connect(self, websocket: WebSocket, job_id: int):
@@ -30,8 +32,14 @@ class ConnectionManager:
         self.active_connections[job_id].add(websocket)
         logger.info(f"WebSocket connected for job {job_id}. Total connections: {len(self.active_connections[job_id])}")
 
+        # First connection for the job starts its subscription
+        if job_id not in self.subscriptions:
+            self.subscriptions[job_id] = asyncio.create_task(
+                self.subscribe_to_job_updates(job_id)
+            )
+
     def disconnect(self, websocket: WebSocket, job_id: int):
-        """Remove WebSocket connection"""
+        """Remove WebSocket connection, dropping the job's subscription after the last one"""
         if job_id in self.active_connections:
             self.active_connections[job_id].discard(websocket)
 
@@ -39,22 +47,33 @@ class ConnectionManager:
             if not self.active_connections[job_id]:
                 del self.active_connections[job_id]
 
+                subscription = self.subscriptions.pop(job_id, None)
+                if subscription is not None and not subscription.done():
+                    subscription.cancel()
+
             logger.info(f"WebSocket disconnected for job {job_id}")
 
     async def broadcast_to_job(self, job_id: int, message: dict):
         """Broadcast message to all connections for a specific job"""
+        await self._broadcast_text(job_id, orjson.dumps(message).decode())
+
+    async def _broadcast_text(self, job_id: int, text: str):
+        """Send an already-encoded message to all connections for a job concurrently"""
         if job_id not in self.active_connections:
             return
 
         # Create a copy to avoid modification during iteration
         connections = list(self.active_connections[job_id])
 
-        for connection in connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending to WebSocket for job {job_id}: {e}")
-                self.disconnect(connection, job_id)
+        await asyncio.gather(*(self._send_text(connection, job_id, text) for connection in connections))
+
+    async def _send_text(self, connection: WebSocket, job_id: int, text: str):
+        """Send to one connection, dropping it if the send fails"""
+        try:
+            await connection.send_text(text)
+        except Exception as e:
+            logger.error(f"Error sending to WebSocket for job {job_id}: {e}")
+            self.disconnect(connection, job_id)
 
     async def get_redis(self):
         """Get or create Redis connection"""
@@ -71,8 +90,8 @@ class ConnectionManager:
         redis = await self.get_redis()
         channel_name = f"job:{job_id}:updates"
 
+        pubsub = redis.pubsub()
         try:
-            pubsub = redis.pubsub()
             await pubsub.subscribe(channel_name)
 
             logger.info(f"Subscribed to Redis channel: {channel_name}")
@@ -80,10 +99,12 @@ class ConnectionManager:
             async for message in pubsub.listen():
                 if message["type"] == "message":
                     try:
-                        data = json.loads(message["data"])
-                        await self.broadcast_to_job(job_id, data)
-                    except json.JSONDecodeError as e:
+                        # Validate once, then forward the published text as-is
+                        orjson.loads(message["data"])
+                    except orjson.JSONDecodeError as e:
                         logger.error(f"Failed to decode message: {e}")
+                    else:
+                        await self._broadcast_text(job_id, message["data"])
 
                 # Stop listening if no more connections
                 if job_id not in self.active_connections:
@@ -95,6 +116,8 @@ class ConnectionManager:
             logger.error(f"Error in Redis subscription for job {job_id}: {e}")
         finally:
             await pubsub.close()
+            if self.subscriptions.get(job_id) is asyncio.current_task():
+                del self.subscriptions[job_id]
 
 
 # Global connection manager instance
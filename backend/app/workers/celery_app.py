@@ -1,6 +1,7 @@
 """
 Celery worker configuration
-Handles asynchronous job execution for builds and simulations
+Handles asynchronous job execution for builds, simulations, module extraction
+and periodic maintenance
 """
 from celery import Celery
 from celery.signals import task_prerun, task_postrun, task_failure
@@ -71,6 +72,24 @@ celery_app.conf.task_routes = {
         'queue': 'build',
         'routing_key': 'build.run',
     },
+    'app.workers.tasks.extract_file_modules': {
+        'queue': 'modules',
+        'routing_key': 'modules.extract',
+    },
+    'app.workers.tasks.flush_topic_views': {
+        'queue': 'maintenance',
+        'routing_key': 'maintenance.flush_topic_views',
+    },
+}
+
+# Periodic tasks (run with `celery -A app.workers.celery_app beat`)
+celery_app.conf.beat_schedule = {
+    'flush-topic-views': {
+        'task': 'app.workers.tasks.flush_topic_views',
+        'schedule': float(settings.TOPIC_VIEWS_FLUSH_INTERVAL_SECONDS),
+        # Drop flushes still queued when the next one is due
+        'options': {'expires': float(settings.TOPIC_VIEWS_FLUSH_INTERVAL_SECONDS)},
+    },
 }
 
 # Configure queue priorities (build jobs have higher priority)
@@ -7,6 +7,7 @@ import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from app.core.cache import build_status_cache_key
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -46,6 +47,13 @@ class JobUpdatePublisher:
         except Exception as e:
             logger.error(f"Failed to publish update for job {job_id}: {e}")
 
+    def invalidate_build_status(self, project_id: int):
+        """Drop the cached build status for a project after its job changes"""
+        try:
+            self.redis_client.delete(build_status_cache_key(project_id))
+        except Exception as e:
+            logger.error(f"Failed to invalidate build status for project {project_id}: {e}")
+
     def publish_status(self, job_id: int, status: str):
         """Publish job status change"""
         self.publish_update(job_id, "status", {"status": status})
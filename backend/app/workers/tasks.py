@@ -2,23 +2,152 @@
 Celery tasks for executing simulation and build jobs
 """
 from celery import Task
+from celery.signals import worker_process_shutdown
 from datetime import datetime
+from typing import Optional
+import hashlib
+import os
+import shutil
 import subprocess
 import logging
 import httpx
+import redis
 from pathlib import Path
+from sqlalchemy import Integer, column, update, values
+from sqlalchemy.orm import joinedload
 
 from app.workers.celery_app import celery_app
 from app.db.session import SessionLocal
 from app.models.job import Job, JobStatus
+from app.models.forum import ForumTopic
+from app.models.project import Project
+from app.models.project_file import ProjectFile
+from app.core.cache import TOPIC_VIEWS_FLUSHING_KEY, TOPIC_VIEWS_KEY, TOPIC_VIEWS_VERSION_KEY
 from app.core.config import settings
 from app.services.storage import storage_service
+from app.services.module_extractor import module_extractor
 from app.workers.publisher import publisher
 
 from librelane.container import run_in_container
 
 logger = logging.getLogger(__name__)
 
+# Simulation and build jobs copy every project file: load the project and its
+# files (with the legacy content column) alongside the job, in two queries
+_JOB_WITH_FILES = (
+    joinedload(Job.project).selectinload(Project.files).undefer(ProjectFile.content),
+)
+
+# Shared HTTP client so registry checks reuse pooled connections
+_http_client: Optional[httpx.Client] = None
+
+
+def get_http_client() -> httpx.Client:
+    """Get or create the worker's shared HTTP client"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.Client(
+            follow_redirects=True,
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=300)
+        )
+    return _http_client
+
+
+@worker_process_shutdown.connect
+def close_http_client(**kwargs):
+    """Close the shared HTTP client when a worker process exits"""
+    if _http_client is not None:
+        _http_client.close()
+
+
+def evict_file_cache(cache_dir: Path):
+    """
+    Trim the worker file cache to FILE_CACHE_MAX_MB
+
+    Removes the least recently used entries (oldest mtime; hits touch their
+    entry) until the cache fits.
+
+    Args:
+        cache_dir: File cache directory
+    """
+    entries = []
+    total = 0
+    for entry in cache_dir.iterdir():
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry))
+        total += stat.st_size
+
+    limit = settings.FILE_CACHE_MAX_MB * 1024 * 1024
+    for _, size, entry in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            entry.unlink()
+            total -= size
+        except OSError:
+            pass
+
+
+def copy_stored_file(file: ProjectFile, dest: Path) -> bool:
+    """
+    Write a MinIO-stored project file into a job directory
+
+    Downloads are kept in a worker-local cache keyed by content hash, so
+    rebuilding an unchanged project copies files from disk instead of
+    fetching them from MinIO again. Cached files are re-hashed on every hit
+    and discarded if they no longer match, since job code runs in the same
+    container and could otherwise plant content under a known hash.
+
+    Args:
+        file: Project file stored in MinIO
+        dest: Path to write the file to
+
+    Returns:
+        True if the file was downloaded, False if it came from the cache
+    """
+    cache_path = None
+    if file.content_hash:
+        cache_path = Path(settings.FILE_CACHE_PATH) / file.content_hash
+        try:
+            cached = cache_path.read_bytes()
+        except OSError:
+            cached = None
+        if cached is not None:
+            if hashlib.sha256(cached).hexdigest() == file.content_hash:
+                dest.write_bytes(cached)
+                try:
+                    # Mark as recently used for eviction
+                    os.utime(cache_path)
+                except OSError:
+                    pass
+                return False
+            logger.warning(f"Discarding cached copy of {file.filepath}: hash mismatch")
+            try:
+                cache_path.unlink()
+            except OSError:
+                pass
+
+    content = storage_service.download_file(file.minio_bucket, file.minio_key)
+    dest.write_bytes(content)
+
+    # Only cache content that matches its recorded hash; write to a
+    # temporary name first so concurrent jobs never see a partial file
+    if cache_path is not None and hashlib.sha256(content).hexdigest() == file.content_hash:
+        try:
+            cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, cache_path)
+            evict_file_cache(cache_path.parent)
+        except OSError as e:
+            logger.warning(f"Failed to cache {file.filepath}: {e}")
+
+    return True
+
 
 class DatabaseTask(Task):
     """Base task class that provides database session"""
@@ -43,7 +172,7 @@ def run_simulation(self, job_id: int):
     logger.info(f"Starting simulation job {job_id}")
     
     # Get job from database
-    job = self.db.query(Job).filter(Job.id == job_id).first()
+    job = self.db.query(Job).options(*_JOB_WITH_FILES).filter(Job.id == job_id).first()
     if not job:
         logger.error(f"Job {job_id} not found")
         return {"status": "error", "message": "Job not found"}
@@ -78,10 +207,11 @@ def run_simulation(self, job_id: int):
             try:
                 # Check if file is stored in MinIO
                 if file.use_minio and file.minio_bucket and file.minio_key:
-                    # Download from MinIO
-                    file_content = storage_service.download_file(file.minio_bucket, file.minio_key)
-                    file_path.write_bytes(file_content)
-                    logger.info(f"Copied {file.filepath} from MinIO: {file.minio_key}")
+                    # Download from MinIO (or the local file cache)
+                    if copy_stored_file(file, file_path):
+                        logger.info(f"Copied {file.filepath} from MinIO: {file.minio_key}")
+                    else:
+                        logger.info(f"Copied {file.filepath} from file cache")
                 elif file.content:
                     # Fall back to legacy content field
                     file_path.write_text(file.content)
@@ -197,6 +327,129 @@ def run_simulation(self, job_id: int):
         }
 
 
+@celery_app.task(bind=True, base=DatabaseTask)
+def extract_file_modules(self, file_id: int):
+    """
+    Extract Verilog modules from a project file
+
+    Args:
+        file_id: Database ID of the project file
+
+    Returns:
+        dict: Extraction results including number of modules found
+    """
+    file = self.db.query(ProjectFile).filter(ProjectFile.id == file_id).first()
+    if not file:
+        logger.error(f"File {file_id} not found")
+        return {"status": "error", "message": "File not found"}
+
+    try:
+        if file.use_minio and file.minio_bucket and file.minio_key:
+            content = storage_service.download_file(file.minio_bucket, file.minio_key).decode('utf-8')
+        elif file.content:
+            # Fall back to legacy content field
+            content = file.content
+        else:
+            logger.warning(f"Skipping module extraction for {file.filepath} - no content available")
+            return {"status": "skipped", "file_id": file_id}
+
+        result = module_extractor.extract_modules_from_file(
+            content,
+            file.id,
+            file.project_id,
+            file.filename,
+            self.db
+        )
+        logger.info(f"Extracted {result.modules_found} modules from {file.filename}")
+
+        return {
+            "status": "success",
+            "file_id": file_id,
+            "modules_found": result.modules_found
+        }
+
+    except Exception as e:
+        logger.error(f"Error extracting modules from file {file_id}: {str(e)}")
+        return {
+            "status": "error",
+            "file_id": file_id,
+            "message": str(e)
+        }
+
+
+@celery_app.task(bind=True, base=DatabaseTask)
+def flush_topic_views(self):
+    """
+    Write forum topic views buffered in Redis to the database
+
+    A Redis lock keeps flushes from overlapping. The pending counters are
+    renamed to a separate flushing key, which readers keep counting until
+    the UPDATE commits, so views arriving during the flush start a fresh
+    hash and no view is missing from a response in the meantime. After the
+    commit, one MULTI deletes the batch and bumps the topic views version,
+    which retires topic details cached from rows read before the flush.
+
+    If a flush fails before clearing its key, that batch is retried before
+    taking a new one; a crash in the moment between the commit and the MULTI
+    applies that batch a second time.
+
+    Returns:
+        dict: Number of topics updated
+    """
+    redis_client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    # The timeout frees the lock if a worker dies mid-flush
+    lock = redis_client.lock(f"{TOPIC_VIEWS_KEY}:lock", timeout=300, blocking=False)
+
+    try:
+        if not lock.acquire():
+            logger.info("Topic view flush already running, skipping")
+            return {"status": "skipped", "topics_updated": 0}
+
+        try:
+            if not redis_client.exists(TOPIC_VIEWS_FLUSHING_KEY):
+                try:
+                    redis_client.rename(TOPIC_VIEWS_KEY, TOPIC_VIEWS_FLUSHING_KEY)
+                except redis.ResponseError:
+                    # No views buffered since the last flush
+                    return {"status": "success", "topics_updated": 0}
+
+            pending = redis_client.hgetall(TOPIC_VIEWS_FLUSHING_KEY)
+            rows = [(int(topic_id), int(views)) for topic_id, views in pending.items() if int(views) > 0]
+
+            if rows:
+                # UPDATE ... FROM (VALUES ...) applies every counter in one statement
+                pending_views = values(
+                    column("id", Integer), column("views", Integer), name="pending_views"
+                ).data(rows)
+                self.db.execute(
+                    update(ForumTopic)
+                    .where(ForumTopic.id == pending_views.c.id)
+                    .values(views_count=ForumTopic.views_count + pending_views.c.views)
+                    .execution_options(synchronize_session=False)
+                )
+                self.db.commit()
+
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.delete(TOPIC_VIEWS_FLUSHING_KEY)
+            if rows:
+                pipe.incr(TOPIC_VIEWS_VERSION_KEY)
+            pipe.execute()
+
+            logger.info(f"Flushed buffered views for {len(rows)} topics")
+
+            return {"status": "success", "topics_updated": len(rows)}
+
+        finally:
+            try:
+                lock.release()
+            except redis.exceptions.LockError:
+                # Lock expired and may already belong to another flush
+                pass
+
+    finally:
+        redis_client.close()
+
+
 def update_build_progress(db, job, step_name, progress_percent=None, completed_steps=None):
     """
     Update job progress in database and publish to WebSocket
@@ -223,6 +476,7 @@ def update_build_progress(db, job, step_name, progress_percent=None, completed_s
 
     job.progress_data = progress_data
     db.commit()
+    publisher.invalidate_build_status(job.project_id)
 
     # Publish progress update to WebSocket
     publisher.publish_progress(
@@ -241,6 +495,7 @@ def append_job_logs(db, job, new_logs):
     else:
         job.logs = new_logs
     db.commit()
+    publisher.invalidate_build_status(job.project_id)
 
     # Publish log update to WebSocket
     publisher.publish_log(job.id, new_logs)
@@ -323,9 +578,7 @@ def remote_manifest_exists(image: str) -> bool:
         return False
 
     try:
-        httpx.Client(follow_redirects=True).get(
-            url, headers={"Accept": "application/json"}
-        )
+        get_http_client().get(url, headers={"Accept": "application/json"})
     except httpx.NetworkError:
         logger.error("Couldn't connect to the internet to pull container images.")
         return False
@@ -364,7 +617,7 @@ def run_build(self, job_id: int):
     logger.info(f"Starting LibreLane build job {job_id}")
 
     # Get job from database
-    job = self.db.query(Job).filter(Job.id == job_id).first()
+    job = self.db.query(Job).options(*_JOB_WITH_FILES).filter(Job.id == job_id).first()
     if not job:
         logger.error(f"Job {job_id} not found")
         return {"status": "error", "message": "Job not found"}
@@ -379,6 +632,7 @@ def run_build(self, job_id: int):
         job.started_at = datetime.utcnow()
         job.celery_task_id = self.request.id
         self.db.commit()
+        publisher.invalidate_build_status(job.project_id)
 
         # Get project files
         project = job.project
@@ -433,10 +687,11 @@ def run_build(self, job_id: int):
             try:
                 # Check if file is stored in MinIO
                 if file.use_minio and file.minio_bucket and file.minio_key:
-                    # Download from MinIO
-                    file_content = storage_service.download_file(file.minio_bucket, file.minio_key)
-                    file_path.write_bytes(file_content)
-                    logs.append(f"  - {file.filepath} (from MinIO: {file.minio_key})\n")
+                    # Download from MinIO (or the local file cache)
+                    if copy_stored_file(file, file_path):
+                        logs.append(f"  - {file.filepath} (from MinIO: {file.minio_key})\n")
+                    else:
+                        logs.append(f"  - {file.filepath} (from file cache)\n")
                 elif file.content:
                     # Fall back to legacy content field
                     file_path.write_text(file.content)
@@ -712,6 +967,7 @@ def run_build(self, job_id: int):
         job.completed_at = datetime.utcnow()
         job.artifacts_path = artifacts_path
         self.db.commit()
+        publisher.invalidate_build_status(job.project_id)
 
         logger.info(f"Build job {job_id} completed successfully")
 
@@ -731,6 +987,7 @@ def run_build(self, job_id: int):
         job.completed_at = datetime.utcnow()
         job.error_message = error_msg
         self.db.commit()
+        publisher.invalidate_build_status(job.project_id)
 
         return {
             "status": "error",
@@ -748,6 +1005,7 @@ def run_build(self, job_id: int):
         job.completed_at = datetime.utcnow()
         job.error_message = str(e)
         self.db.commit()
+        publisher.invalidate_build_status(job.project_id)
 
         return {
             "status": "error",
@@ -4,14 +4,15 @@ Multi-tenant SaaS platform for collaborative chip design automation
 """
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import time
 import logging
 
 from app.api.v1.router import api_router
 from app.api.v1.websocket import router as websocket_router
 from app.core.config import settings
-from app.db.session import engine
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db.session import engine, async_engine
 from app.db.base import Base
 
 # Configure logging
@@ -26,7 +27,8 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     description="Cloud-based platform for collaborative chip design automation",
     version="0.1.0",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # CORS configuration for Next.js frontend
@@ -36,6 +38,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
@@ -53,7 +56,7 @@ async def add_process_time_header(request: Request, call_next):
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Global exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
@@ -79,6 +82,7 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down a6hub backend...")
+    await async_engine.dispose()
 
 
 @app.get("/")
@@ -106,6 +110,10 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
+        http="httptools",
+        ws_ping_interval=20,
+        ws_ping_timeout=20,
         reload=True,
         log_level="info"
     )
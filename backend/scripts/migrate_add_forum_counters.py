@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add denormalized counters to the forum tables
+
+Adds the following columns:
+- forum_categories.topic_count (INTEGER, default 0)
+- forum_categories.post_count (INTEGER, default 0)
+- forum_topics.post_count (INTEGER, default 0)
+
+and backfills them from the existing topics and posts.
+
+Usage:
+    python scripts/migrate_add_forum_counters.py
+"""
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.session import engine
+from app.core.config import settings
+
+def run_migration():
+    """Add and backfill topic_count/post_count columns on forum tables"""
+
+    print("=" * 60)
+    print("Migration: Add denormalized counters to forum tables")
+    print("=" * 60)
+    print(f"Database: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'local'}")
+    print()
+
+    # Check if columns already exist using information_schema
+    print("Checking if columns already exist...")
+
+    with engine.connect() as conn:
+        check_query = text("""
+            SELECT table_name, column_name
+            FROM information_schema.columns
+            WHERE (table_name = 'forum_categories' AND column_name IN ('topic_count', 'post_count'))
+            OR (table_name = 'forum_topics' AND column_name = 'post_count')
+        """)
+
+        result = conn.execute(check_query)
+        existing_columns = [f"{row[0]}.{row[1]}" for row in result]
+
+        if len(existing_columns) == 3:
+            print("✓ Columns already exist! No migration needed.")
+            return True
+
+        if existing_columns:
+            print(f"⚠ Warning: Found existing columns: {existing_columns}")
+            print("✗ Partial migration detected. Please check database state.")
+            return False
+
+        print("✗ Columns not found. Proceeding with migration...")
+
+    # Run migration in a new connection with proper transaction handling
+    with engine.begin() as conn:
+        try:
+            print("\n1. Adding counter columns...")
+            conn.execute(text("""
+                ALTER TABLE forum_categories
+                ADD COLUMN topic_count INTEGER NOT NULL DEFAULT 0,
+                ADD COLUMN post_count INTEGER NOT NULL DEFAULT 0
+            """))
+            conn.execute(text("""
+                ALTER TABLE forum_topics
+                ADD COLUMN post_count INTEGER NOT NULL DEFAULT 0
+            """))
+            print("✓ Counter columns added successfully")
+
+            print("\n2. Backfilling forum_topics.post_count...")
+            conn.execute(text("""
+                UPDATE forum_topics t
+                SET post_count = c.cnt
+                FROM (
+                    SELECT topic_id, COUNT(*) AS cnt
+                    FROM forum_posts
+                    GROUP BY topic_id
+                ) c
+                WHERE c.topic_id = t.id
+            """))
+            print("✓ forum_topics.post_count backfilled")
+
+            print("\n3. Backfilling forum_categories counters...")
+            conn.execute(text("""
+                UPDATE forum_categories fc
+                SET topic_count = c.topics, post_count = c.posts
+                FROM (
+                    SELECT category_id, COUNT(*) AS topics, SUM(post_count) AS posts
+                    FROM forum_topics
+                    GROUP BY category_id
+                ) c
+                WHERE c.category_id = fc.id
+            """))
+            print("✓ forum_categories counters backfilled")
+
+            print("\n" + "=" * 60)
+            print("Migration completed successfully!")
+            print("=" * 60)
+
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Migration failed: {e}")
+            print("\nTransaction will be rolled back automatically...")
+            raise
+
+if __name__ == "__main__":
+    print()
+    try:
+        success = run_migration()
+        print()
+
+        if success:
+            sys.exit(0)
+        else:
+            print("Migration failed. Please check the error messages above.")
+            sys.exit(1)
+    except Exception as e:
+        print()
+        print("Migration failed. Please check the error messages above.")
+        sys.exit(1)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Database migration script to track each forum topic's first post
+
+Adds the following column:
+- forum_topics.first_post_id (INTEGER, nullable)
+
+and backfills it with the earliest post of each topic.
+
+Usage:
+    python scripts/migrate_add_forum_first_post.py
+"""
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.session import engine
+from app.core.config import settings
+
+def run_migration():
+    """Add and backfill first_post_id column on forum_topics table"""
+
+    print("=" * 60)
+    print("Migration: Add first_post_id to forum_topics table")
+    print("=" * 60)
+    print(f"Database: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'local'}")
+    print()
+
+    # Check if column already exists using information_schema
+    print("Checking if column already exists...")
+
+    with engine.connect() as conn:
+        check_query = text("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = 'forum_topics'
+            AND column_name = 'first_post_id'
+        """)
+
+        result = conn.execute(check_query)
+        if result.first():
+            print("✓ Column already exists! No migration needed.")
+            return True
+
+        print("✗ Column not found. Proceeding with migration...")
+
+    # Run migration in a new connection with proper transaction handling
+    with engine.begin() as conn:
+        try:
+            print("\n1. Adding first_post_id column...")
+            conn.execute(text("""
+                ALTER TABLE forum_topics
+                ADD COLUMN first_post_id INTEGER
+            """))
+            print("✓ first_post_id column added successfully")
+
+            print("\n2. Backfilling forum_topics.first_post_id...")
+            conn.execute(text("""
+                UPDATE forum_topics t
+                SET first_post_id = first.id
+                FROM (
+                    SELECT DISTINCT ON (topic_id) topic_id, id
+                    FROM forum_posts
+                    ORDER BY topic_id, created_at, id
+                ) first
+                WHERE first.topic_id = t.id
+            """))
+            print("✓ forum_topics.first_post_id backfilled")
+
+            print("\n" + "=" * 60)
+            print("Migration completed successfully!")
+            print("=" * 60)
+
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Migration failed: {e}")
+            print("\nTransaction will be rolled back automatically...")
+            raise
+
+if __name__ == "__main__":
+    print()
+    try:
+        success = run_migration()
+        print()
+
+        if success:
+            sys.exit(0)
+        else:
+            print("Migration failed. Please check the error messages above.")
+            sys.exit(1)
+    except Exception as e:
+        print()
+        print("Migration failed. Please check the error messages above.")
+        sys.exit(1)
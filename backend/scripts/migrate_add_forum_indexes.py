@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add pagination indexes to the forum tables
+
+Backfills and sets NOT NULL on the listing sort columns, since a NULL in
+a row value comparison drops the row from every page after the first:
+- forum_topics.is_pinned (NULL -> false)
+- forum_topics.last_post_at (NULL -> created_at, or now())
+- forum_posts.created_at (NULL -> now())
+
+Adds the following indexes:
+- ix_forum_topics_category_listing ON forum_topics (category_id, is_pinned DESC, last_post_at DESC, id DESC)
+- ix_forum_posts_topic_created ON forum_posts (topic_id, created_at, id)
+
+These back the keyset (cursor) pagination of topic and post listings.
+
+Usage:
+    python scripts/migrate_add_forum_indexes.py
+"""
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.session import engine
+from app.core.config import settings
+
+# (table, column, backfill value for NULLs, default)
+NOT_NULL_COLUMNS = [
+    ("forum_topics", "is_pinned", "false", "false"),
+    ("forum_topics", "last_post_at", "COALESCE(created_at, now())", "now()"),
+    ("forum_posts", "created_at", "now()", "now()"),
+]
+
+INDEXES = [
+    (
+        "forum_topics",
+        "ix_forum_topics_category_listing",
+        "ON forum_topics (category_id, is_pinned DESC, last_post_at DESC, id DESC)",
+    ),
+    (
+        "forum_posts",
+        "ix_forum_posts_topic_created",
+        "ON forum_posts (topic_id, created_at, id)",
+    ),
+]
+
+def run_migration():
+    """Add keyset pagination indexes to forum tables"""
+
+    print("=" * 60)
+    print("Migration: Add pagination indexes to forum tables")
+    print("=" * 60)
+    print(f"Database: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'local'}")
+    print()
+
+    # Check which sort columns still allow NULLs and which indexes exist
+    print("Checking sort columns and existing indexes...")
+
+    with engine.connect() as conn:
+        nullable_query = text("""
+            SELECT table_name, column_name
+            FROM information_schema.columns
+            WHERE table_name IN ('forum_topics', 'forum_posts')
+            AND is_nullable = 'YES'
+        """)
+
+        nullable = {(row[0], row[1]) for row in conn.execute(nullable_query)}
+        columns = [column for column in NOT_NULL_COLUMNS if column[:2] in nullable]
+
+        check_query = text("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE tablename IN ('forum_topics', 'forum_posts')
+        """)
+
+        existing = {row[0] for row in conn.execute(check_query)}
+        missing = [index for index in INDEXES if index[1] not in existing]
+        if not columns and not missing:
+            print("✓ All sort columns are NOT NULL and all indexes exist! No migration needed.")
+            return True
+
+        print(f"✗ {len(columns)} nullable sort column(s), {len(missing)} index(es) missing. Proceeding with migration...")
+
+    # Run migration in a new connection with proper transaction handling
+    with engine.begin() as conn:
+        try:
+            for step, (table, column, backfill, default) in enumerate(columns, start=1):
+                print(f"\n{step}. Making {table}.{column} NOT NULL...")
+                conn.execute(text(f"UPDATE {table} SET {column} = {backfill} WHERE {column} IS NULL"))
+                conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT {default}"))
+                conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL"))
+                print(f"✓ {table}.{column} is NOT NULL")
+
+            for step, (table, name, definition) in enumerate(missing, start=len(columns) + 1):
+                print(f"\n{step}. Creating {name} index on {table}...")
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} {definition}"))
+                print(f"✓ {name} index created successfully")
+
+            print("\n" + "=" * 60)
+            print("Migration completed successfully!")
+            print("=" * 60)
+
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Migration failed: {e}")
+            print("\nTransaction will be rolled back automatically...")
+            raise
+
+if __name__ == "__main__":
+    print()
+    try:
+        success = run_migration()
+        print()
+
+        if success:
+            sys.exit(0)
+        else:
+            print("Migration failed. Please check the error messages above.")
+            sys.exit(1)
+    except Exception as e:
+        print()
+        print("Migration failed. Please check the error messages above.")
+        sys.exit(1)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Database migration script to make forum topic slugs unique per category
+
+Adds the following index:
+- uq_forum_topics_category_slug UNIQUE ON forum_topics (category_id, slug)
+
+Topics renamed before this migration may share a slug within a category;
+those duplicates (all but the oldest) get their topic id appended, with the
+slug shortened so it still fits the column. A renamed slug can collide with
+an existing one, so renaming repeats until no duplicates are left.
+
+Usage:
+    python scripts/migrate_add_forum_slug_unique.py
+"""
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.session import engine
+from app.core.config import settings
+
+# forum_topics.slug is String(200)
+SLUG_MAX_LENGTH = 200
+
+# Each pass renames the newer topic of every colliding pair; a renamed slug
+# only collides again by chance, so a handful of passes is plenty
+MAX_RENAME_PASSES = 10
+
+def run_migration():
+    """Add unique (category_id, slug) index to forum_topics table"""
+
+    print("=" * 60)
+    print("Migration: Add unique slug index to forum_topics table")
+    print("=" * 60)
+    print(f"Database: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'local'}")
+    print()
+
+    # Check if index already exists
+    print("Checking if index already exists...")
+
+    with engine.connect() as conn:
+        check_query = text("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE tablename = 'forum_topics'
+            AND indexname = 'uq_forum_topics_category_slug'
+        """)
+
+        result = conn.execute(check_query)
+        if result.first():
+            print("✓ Index already exists! No migration needed.")
+            return True
+
+        print("✗ Index not found. Proceeding with migration...")
+
+    # Run migration in a new connection with proper transaction handling
+    with engine.begin() as conn:
+        try:
+            print("\n1. Renaming duplicate slugs...")
+            renamed = 0
+            for attempt in range(MAX_RENAME_PASSES):
+                # Later passes add the pass number, so a slug truncated to
+                # the column length still changes
+                suffix = "'-' || t.id" if attempt == 0 else f"'-' || t.id || '-{attempt}'"
+                result = conn.execute(
+                    text(f"""
+                        UPDATE forum_topics t
+                        SET slug = left(t.slug, :max_length - length({suffix})) || {suffix}
+                        FROM forum_topics original
+                        WHERE original.category_id = t.category_id
+                        AND original.slug = t.slug
+                        AND original.id < t.id
+                    """),
+                    {"max_length": SLUG_MAX_LENGTH}
+                )
+                if result.rowcount == 0:
+                    break
+                renamed += result.rowcount
+
+            duplicates = conn.execute(text("""
+                SELECT count(*)
+                FROM (
+                    SELECT 1
+                    FROM forum_topics
+                    GROUP BY category_id, slug
+                    HAVING count(*) > 1
+                ) duplicate_slugs
+            """)).scalar()
+            if duplicates:
+                raise RuntimeError(
+                    f"{duplicates} duplicate slug(s) remain after {MAX_RENAME_PASSES} renaming passes"
+                )
+            print(f"✓ {renamed} duplicate slug(s) renamed")
+
+            print("\n2. Creating uq_forum_topics_category_slug index...")
+            conn.execute(text("""
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_forum_topics_category_slug
+                ON forum_topics (category_id, slug)
+            """))
+            print("✓ uq_forum_topics_category_slug index created successfully")
+
+            print("\n" + "=" * 60)
+            print("Migration completed successfully!")
+            print("=" * 60)
+
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Migration failed: {e}")
+            print("\nTransaction will be rolled back automatically...")
+            raise
+
+if __name__ == "__main__":
+    print()
+    try:
+        success = run_migration()
+        print()
+
+        if success:
+            sys.exit(0)
+        else:
+            print("Migration failed. Please check the error messages above.")
+            sys.exit(1)
+    except Exception as e:
+        print()
+        print("Migration failed. Please check the error messages above.")
+        sys.exit(1)
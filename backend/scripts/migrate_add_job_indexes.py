@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add a composite index on the jobs table
+
+Adds the following index:
+- ix_jobs_project_type_created ON jobs (project_id, job_type, created_at DESC)
+
+Speeds up the "latest build job for a project" lookups used by the build
+config and build status endpoints.
+
+Usage:
+    python scripts/migrate_add_job_indexes.py
+"""
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.session import engine
+from app.core.config import settings
+
+def run_migration():
+    """Add composite (project_id, job_type, created_at DESC) index to jobs table"""
+
+    print("=" * 60)
+    print("Migration: Add composite index to jobs table")
+    print("=" * 60)
+    print(f"Database: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'local'}")
+    print()
+
+    # Check if index already exists
+    print("Checking if index already exists...")
+
+    with engine.connect() as conn:
+        check_query = text("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE tablename = 'jobs'
+            AND indexname = 'ix_jobs_project_type_created'
+        """)
+
+        result = conn.execute(check_query)
+        if result.first():
+            print("✓ Index already exists! No migration needed.")
+            return True
+
+        print("✗ Index not found. Proceeding with migration...")
+
+    # Run migration in a new connection with proper transaction handling
+    with engine.begin() as conn:
+        try:
+            print("\n1. Creating ix_jobs_project_type_created index...")
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_jobs_project_type_created
+                ON jobs (project_id, job_type, created_at DESC)
+            """))
+            print("✓ ix_jobs_project_type_created index created successfully")
+
+            print("\n" + "=" * 60)
+            print("Migration completed successfully!")
+            print("=" * 60)
+
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Migration failed: {e}")
+            print("\nTransaction will be rolled back automatically...")
+            raise
+
+if __name__ == "__main__":
+    print()
+    try:
+        success = run_migration()
+        print()
+
+        if success:
+            sys.exit(0)
+        else:
+            print("Migration failed. Please check the error messages above.")
+            sys.exit(1)
+    except Exception as e:
+        print()
+        print("Migration failed. Please check the error messages above.")
+        sys.exit(1)
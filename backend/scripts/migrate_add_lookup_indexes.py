@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add lookup indexes to the jobs and project_files tables
+
+Adds the following indexes:
+- ix_jobs_project_created ON jobs (project_id, created_at DESC)
+- ix_project_files_project_filepath ON project_files (project_id, filepath)
+
+These back the project job listing and the per-project file listing and
+duplicate-path checks.
+
+Usage:
+    python scripts/migrate_add_lookup_indexes.py
+"""
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.session import engine
+from app.core.config import settings
+
+INDEXES = [
+    (
+        "jobs",
+        "ix_jobs_project_created",
+        "ON jobs (project_id, created_at DESC)",
+    ),
+    (
+        "project_files",
+        "ix_project_files_project_filepath",
+        "ON project_files (project_id, filepath)",
+    ),
+]
+
+def run_migration():
+    """Add lookup indexes to jobs and project_files tables"""
+
+    print("=" * 60)
+    print("Migration: Add lookup indexes to jobs and project_files tables")
+    print("=" * 60)
+    print(f"Database: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'local'}")
+    print()
+
+    # Check which indexes already exist
+    print("Checking existing indexes...")
+
+    with engine.connect() as conn:
+        check_query = text("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE tablename IN ('jobs', 'project_files')
+        """)
+
+        existing = {row[0] for row in conn.execute(check_query)}
+        missing = [index for index in INDEXES if index[1] not in existing]
+        if not missing:
+            print("✓ All indexes already exist! No migration needed.")
+            return True
+
+        print(f"✗ {len(missing)} index(es) missing. Proceeding with migration...")
+
+    # Run migration in a new connection with proper transaction handling
+    with engine.begin() as conn:
+        try:
+            for step, (table, name, definition) in enumerate(missing, start=1):
+                print(f"\n{step}. Creating {name} index on {table}...")
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} {definition}"))
+                print(f"✓ {name} index created successfully")
+
+            print("\n" + "=" * 60)
+            print("Migration completed successfully!")
+            print("=" * 60)
+
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Migration failed: {e}")
+            print("\nTransaction will be rolled back automatically...")
+            raise
+
+if __name__ == "__main__":
+    print()
+    try:
+        success = run_migration()
+        print()
+
+        if success:
+            sys.exit(0)
+        else:
+            print("Migration failed. Please check the error messages above.")
+            sys.exit(1)
+    except Exception as e:
+        print()
+        print("Migration failed. Please check the error messages above.")
+        sys.exit(1)
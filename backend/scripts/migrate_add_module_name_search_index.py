@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add a trigram index for module name search
+
+Enables the pg_trgm extension and adds:
+- ix_modules_name_trgm ON modules USING gin (name gin_trgm_ops)
+
+This lets the module listing's substring search (ILIKE '%...%') use an
+index instead of scanning every module.
+
+Usage:
+    python scripts/migrate_add_module_name_search_index.py
+"""
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.session import engine
+from app.core.config import settings
+
+def run_migration():
+    """Add trigram index on modules.name"""
+
+    print("=" * 60)
+    print("Migration: Add trigram index for module name search")
+    print("=" * 60)
+    print(f"Database: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'local'}")
+    print()
+
+    # Check if index already exists
+    print("Checking existing indexes...")
+
+    with engine.connect() as conn:
+        check_query = text("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE tablename = 'modules' AND indexname = 'ix_modules_name_trgm'
+        """)
+
+        if conn.execute(check_query).first():
+            print("✓ Index already exists! No migration needed.")
+            return True
+
+        print("✗ Index missing. Proceeding with migration...")
+
+    # Run migration in a new connection with proper transaction handling
+    with engine.begin() as conn:
+        try:
+            print("\n1. Enabling pg_trgm extension...")
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            print("✓ pg_trgm extension enabled")
+
+            print("\n2. Creating ix_modules_name_trgm index on modules...")
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_modules_name_trgm "
+                "ON modules USING gin (name gin_trgm_ops)"
+            ))
+            print("✓ ix_modules_name_trgm index created successfully")
+
+            print("\n" + "=" * 60)
+            print("Migration completed successfully!")
+            print("=" * 60)
+
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Migration failed: {e}")
+            print("\nTransaction will be rolled back automatically...")
+            raise
+
+if __name__ == "__main__":
+    print()
+    try:
+        success = run_migration()
+        print()
+
+        if success:
+            sys.exit(0)
+        else:
+            print("Migration failed. Please check the error messages above.")
+            sys.exit(1)
+    except Exception as e:
+        print()
+        print("Migration failed. Please check the error messages above.")
+        sys.exit(1)
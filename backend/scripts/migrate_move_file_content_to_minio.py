@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Database migration script to move legacy project file content into MinIO
+
+Uploads every project_files row that still keeps its content in the
+deprecated content column to MinIO, then points the row at the uploaded
+object and clears the column. Each file is committed on its own, so the
+script can be re-run after a failure and only picks up the remaining rows.
+
+Once it has run, no file is read from the content column any more and the
+column can be dropped.
+
+Usage:
+    python scripts/migrate_move_file_content_to_minio.py
+"""
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.session import engine
+from app.core.config import settings
+from app.services.storage import storage_service
+
+def run_migration():
+    """Move legacy project_files.content values into MinIO"""
+
+    print("=" * 60)
+    print("Migration: Move project file content into MinIO")
+    print("=" * 60)
+    print(f"Database: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'local'}")
+    print()
+
+    # Find files still stored in the database
+    print("Checking for files stored in the database...")
+
+    with engine.connect() as conn:
+        check_query = text("""
+            SELECT id
+            FROM project_files
+            WHERE content IS NOT NULL
+            AND (minio_bucket IS NULL OR minio_key IS NULL)
+            ORDER BY id
+        """)
+
+        file_ids = [row[0] for row in conn.execute(check_query)]
+        if not file_ids:
+            print("✓ No files left in the database! No migration needed.")
+            return True
+
+        print(f"✗ {len(file_ids)} file(s) stored in the database. Proceeding with migration...")
+
+    # Upload one file at a time so only one file's content is in memory
+    for step, file_id in enumerate(file_ids, start=1):
+        with engine.begin() as conn:
+            try:
+                row = conn.execute(
+                    text("""
+                        SELECT project_id, filename, mime_type, content
+                        FROM project_files
+                        WHERE id = :id
+                        FOR UPDATE
+                    """),
+                    {"id": file_id}
+                ).first()
+                if row is None or row.content is None:
+                    continue
+
+                print(f"\n{step}. Uploading file {file_id} ({row.filename})...")
+                file_bytes = row.content.encode('utf-8')
+                bucket, key, content_hash = storage_service.upload_file(
+                    file_bytes,
+                    row.project_id,
+                    file_id,
+                    row.filename,
+                    row.mime_type or "text/plain"
+                )
+
+                conn.execute(
+                    text("""
+                        UPDATE project_files
+                        SET minio_bucket = :bucket,
+                            minio_key = :key,
+                            content_hash = :content_hash,
+                            size_bytes = :size_bytes,
+                            use_minio = TRUE,
+                            content = NULL
+                        WHERE id = :id
+                    """),
+                    {
+                        "bucket": bucket,
+                        "key": key,
+                        "content_hash": content_hash,
+                        "size_bytes": len(file_bytes),
+                        "id": file_id,
+                    }
+                )
+                print(f"✓ File {file_id} moved to MinIO: {key}")
+
+            except Exception as e:
+                print(f"\n✗ Migration failed: {e}")
+                print("\nTransaction for this file will be rolled back automatically...")
+                raise
+
+    print("\n" + "=" * 60)
+    print("Migration completed successfully!")
+    print("=" * 60)
+
+    return True
+
+if __name__ == "__main__":
+    print()
+    try:
+        success = run_migration()
+        print()
+
+        if success:
+            sys.exit(0)
+        else:
+            print("Migration failed. Please check the error messages above.")
+            sys.exit(1)
+    except Exception as e:
+        print()
+        print("Migration failed. Please check the error messages above.")
+        sys.exit(1)
@@ -21,8 +21,21 @@ export REDIS_PORT=6379
 export POSTGRES_HOST=localhost
 export POSTGRES_PORT=5432
 
-# Start Celery worker
+# Start Celery workers
 cd "$(dirname "$0")/.."
+
+# Module extraction and maintenance tasks get their own worker (with the
+# embedded beat scheduler) so they are not queued behind long builds
+celery -A app.workers.celery_app worker \
+    --loglevel=info \
+    --queues=modules,maintenance \
+    --hostname=modules@%h \
+    --beat \
+    --concurrency=2 \
+    --max-tasks-per-child=50 &
+MODULES_WORKER_PID=$!
+trap 'kill $MODULES_WORKER_PID 2>/dev/null' EXIT
+
 celery -A app.workers.celery_app worker \
     --loglevel=info \
     --queues=build,simulation \
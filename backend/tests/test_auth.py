@@ -1,33 +1,31 @@
 """
 Tests for authentication endpoints
 """
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 
 from main import app
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import get_async_db
 
 # Test database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# No pooling: the client and the fixtures each run their own event loop
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+TestingSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
+async def override_get_async_db():
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 client = TestClient(app)
 
@@ -35,9 +33,13 @@ client = TestClient(app)
 @pytest.fixture(scope="function")
 def setup_database():
     """Setup test database"""
-    Base.metadata.create_all(bind=engine)
+    async def run(operation):
+        async with engine.begin() as conn:
+            await conn.run_sync(operation)
+
+    asyncio.run(run(Base.metadata.create_all))
     yield
-    Base.metadata.drop_all(bind=engine)
+    asyncio.run(run(Base.metadata.drop_all))
 
 
 def test_register_user(setup_database):
@@ -5,7 +5,7 @@
 import { useEffect, useRef, useState, useCallback } from 'react';
 
 export interface JobUpdate {
-  type: 'connected' | 'status' | 'progress' | 'log' | 'step' | 'complete' | 'error' | 'pong';
+  type: 'connected' | 'status' | 'progress' | 'log' | 'step' | 'complete' | 'error';
   data: {
     job_id?: number;
     status?: string;
@@ -133,10 +133,6 @@ export function useJobWebSocket(options: UseJobWebSocketOptions) {
                 onError(update.data.error_message);
               }
               break;
-
-            case 'pong':
-              // Keep-alive response
-              break;
           }
         } catch (error) {
           console.error('[WebSocket] Error parsing message:', error);
@@ -186,12 +182,6 @@ export function useJobWebSocket(options: UseJobWebSocketOptions) {
     setIsConnected(false);
   }, []);
 
-  const sendPing = useCallback(() => {
-    if (wsRef.current?.readyState === WebSocket.OPEN) {
-      wsRef.current.send('ping');
-    }
-  }, []);
-
   // Connect on mount, disconnect on unmount
   useEffect(() => {
     if (enabled) {
@@ -203,17 +193,6 @@ export function useJobWebSocket(options: UseJobWebSocketOptions) {
     };
   }, [enabled, connect, disconnect]);
 
-  // Keep-alive ping every 30 seconds
-  useEffect(() => {
-    if (!isConnected) return;
-
-    const pingInterval = setInterval(() => {
-      sendPing();
-    }, 30000);
-
-    return () => clearInterval(pingInterval);
-  }, [isConnected, sendPing]);
-
   return {
     isConnected,
     connectionError,